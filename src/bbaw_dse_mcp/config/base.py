@@ -59,6 +59,10 @@ class Settings(BaseSettings):
     )
     ab_username: str | None = Field(default=None)
     ab_password: str | None = Field(default=None)
+    ab_wohntopo_cache_dir: Path | None = Field(
+        default=Path.home() / ".cache" / "bbaw-dse-mcp" / "wohntopo",
+        description="Local directory for cached Wohntopographie GeoJSON (None disables it)",
+    )
 
     # correspSearch
     cs_api_url: str = Field(
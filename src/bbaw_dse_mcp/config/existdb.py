@@ -12,6 +12,12 @@ class ExistDBConfig(BaseModel):
     username: str | None = Field(default=None, description="Username für Auth")
     password: str | None = Field(default=None, description="Password für Auth")
     timeout: float = Field(default=30.0, description="Request timeout in Sekunden")
+    max_connections: int = Field(
+        default=64, description="Maximale Anzahl gleichzeitiger Verbindungen"
+    )
+    max_keepalive_connections: int = Field(
+        default=32, description="Maximale Anzahl offen gehaltener Keep-Alive-Verbindungen"
+    )
 
     @classmethod
     def local(
@@ -4,6 +4,8 @@ Composite MCP Server for BBAW Digital Scholarly Editions.
 Aggregates multiple digital scholarly editions via FastMCP mount().
 """
 
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 import logging
 
 from fastmcp import FastMCP
@@ -11,6 +13,10 @@ from fastmcp import FastMCP
 from bbaw_dse_mcp.config.base import settings
 from bbaw_dse_mcp.servers.correspsearch import server as correspsearch
 from bbaw_dse_mcp.servers.mop import server as mop
+from bbaw_dse_mcp.servers.mop.tools.wohntopo import (
+    start_wohntopo_maintenance,
+    stop_wohntopo_maintenance,
+)
 from bbaw_dse_mcp.servers.schleiermacher import server as schleiermacher
 
 # Setup logging
@@ -21,6 +27,21 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(_server: FastMCP) -> AsyncIterator[None]:
+    """Run background maintenance for the lifetime of the server.
+
+    Prewarms and periodically revalidates the Wohntopographie datasets; on
+    shutdown the refresh loop is cancelled and its HTTP client closed.
+    """
+    start_wohntopo_maintenance()
+    try:
+        yield
+    finally:
+        await stop_wohntopo_maintenance()
+
+
 # Main aggregator server
 app = FastMCP(
     name=settings.server_name,
@@ -38,6 +59,7 @@ app = FastMCP(
     3. sd_search_register → Look up persons/places
     4. cs_search_correspondences → Cross-edition research
     """,
+    lifespan=lifespan,
 )
 
 # Mount edition servers with prefixes
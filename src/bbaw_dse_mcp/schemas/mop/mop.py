@@ -4,12 +4,21 @@ Provides Pydantic models for:
 - Wohntopographie (Residential Topography) - GeoJSON-based person/address data
 - ResidentialPerson - Person or institution properties
 - GeoJSONFeature - Individual geographic feature with person data
+
+A dataset holds thousands of features per year, so the per-feature types are
+slotted pydantic dataclasses: they are validated like models but store their
+fields in slots instead of a per-instance ``__dict__``.
 """
 
-from pydantic import BaseModel, Field
+from array import array
+from typing import ClassVar
+
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
+from pydantic.dataclasses import dataclass
 
 
-class ResidentialPerson(BaseModel):
+@dataclass(slots=True, kw_only=True, config=ConfigDict(populate_by_name=True))
+class ResidentialPerson:
     """A person or institution entry from the Wohntopographie dataset."""
 
     tabellen_id: int | None = Field(None, alias="Tabellen-ID")
@@ -46,18 +55,17 @@ class ResidentialPerson(BaseModel):
     bem_2: str | None = Field(None, alias="Bem.2")
     wkt_geom_source: int | None = Field(None, alias="wkt_geom source")
 
-    class Config:
-        populate_by_name = True
-
 
-class GeoJSONGeometry(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class GeoJSONGeometry:
     """GeoJSON geometry (Point)."""
 
     type: str = Field(..., description="Geometry type (e.g., 'Point')")
     coordinates: list[float] | None = Field(None, description="[longitude, latitude]")
 
 
-class GeoJSONFeature(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class GeoJSONFeature:
     """A single GeoJSON feature with person/institution data."""
 
     type: str = Field(default="Feature")
@@ -72,6 +80,15 @@ class GeoJSONFeature(BaseModel):
             and len(self.geometry.coordinates) == 2
         )
 
+    def coordinates_pair(self) -> tuple[float, float] | None:
+        """Return (longitude, latitude), or None if the coordinates are not valid."""
+        geometry = self.geometry
+        # The explicit None checks narrow the types, has_coordinates() does not
+        if geometry is None or geometry.coordinates is None or not self.has_coordinates():
+            return None
+        longitude, latitude = geometry.coordinates
+        return longitude, latitude
+
     def get_longitude(self) -> float | None:
         """Get longitude coordinate."""
         if self.has_coordinates():
@@ -88,12 +105,149 @@ class GeoJSONFeature(BaseModel):
 class ResidentialTopography(BaseModel):
     """Complete Wohntopographie dataset (GeoJSON FeatureCollection)."""
 
+    # Text fields supporting case-insensitive substring search
+    SEARCH_FIELDS: ClassVar[tuple[str, ...]] = (
+        "name",
+        "vorname",
+        "kategorie1",
+        "kategorie2",
+        "taetigkeit",
+        "stadt",
+        "strasse",
+    )
+    # Patterns at least this long are narrowed down via the trigram index
+    # before being verified; shorter single-word ones via the token index
+    NGRAM_MIN_PATTERN: ClassVar[int] = 5
+    NGRAM_SIZE: ClassVar[int] = 3
+
     type: str = Field(default="FeatureCollection")
     features: list[GeoJSONFeature] = Field(default_factory=list)
 
+    # Search index, built once by build_search_index()
+    _folded: dict[str, list[str]] = PrivateAttr(default_factory=dict)
+    _trigrams: dict[str, dict[str, set[int]]] = PrivateAttr(default_factory=dict)
+    _tokens: dict[str, dict[str, set[int]]] = PrivateAttr(default_factory=dict)
+    _by_ediarum_id: dict[str, list[int]] = PrivateAttr(default_factory=dict)
+    # Coordinates as parallel arrays by feature position, NaN where missing
+    _longitudes: array = PrivateAttr(default_factory=lambda: array("d"))
+    _latitudes: array = PrivateAttr(default_factory=lambda: array("d"))
+
+    def build_search_index(self) -> None:
+        """Precompute case-folded field values, trigram, token and ID indices.
+
+        For every field in SEARCH_FIELDS, stores the case-folded value of
+        each feature (by feature position) and maps each trigram and each
+        whitespace-separated token of those values to the positions
+        containing it. Ediarum-IDs are mapped to the
+        positions of their entries, and the coordinates are copied into
+        compact longitude and latitude arrays for spatial filtering.
+        """
+        self._by_ediarum_id = {}
+        self._longitudes = array("d")
+        self._latitudes = array("d")
+        nan = float("nan")
+        for i, f in enumerate(self.features):
+            if f.properties.ediarum_id:
+                self._by_ediarum_id.setdefault(f.properties.ediarum_id, []).append(i)
+            longitude, latitude = f.coordinates_pair() or (nan, nan)
+            self._longitudes.append(longitude)
+            self._latitudes.append(latitude)
+        size = self.NGRAM_SIZE
+        for field in self.SEARCH_FIELDS:
+            folded = [
+                (getattr(f.properties, field) or "").casefold() for f in self.features
+            ]
+            trigrams: dict[str, set[int]] = {}
+            tokens: dict[str, set[int]] = {}
+            for i, value in enumerate(folded):
+                for start in range(len(value) - size + 1):
+                    trigrams.setdefault(value[start : start + size], set()).add(i)
+                for token in value.split():
+                    tokens.setdefault(token, set()).add(i)
+            self._folded[field] = folded
+            self._trigrams[field] = trigrams
+            self._tokens[field] = tokens
+
+    def folded_values(self, field: str) -> list[str]:
+        """Return the case-folded values of a search field by feature position."""
+        if not self._folded:
+            self.build_search_index()
+        return self._folded[field]
+
+    def substring_candidates(self, field: str, pattern: str) -> set[int] | None:
+        """Return positions of features whose field may contain pattern.
+
+        Args:
+            field: One of SEARCH_FIELDS
+            pattern: Case-folded search pattern
+
+        Short patterns are looked up in the token index: a pattern without
+        whitespace can only occur inside a single token, so scanning the
+        distinct tokens of a field replaces scanning all features.
+
+        Returns:
+            Superset of the matching feature positions, or None if the pattern
+            is too short for the trigram index and spans several tokens, so
+            all features must be checked
+        """
+        if not self._trigrams:
+            self.build_search_index()
+        if len(pattern) < self.NGRAM_MIN_PATTERN:
+            if pattern.split() != [pattern]:
+                return None
+            matches: set[int] = set()
+            for token, positions in self._tokens[field].items():
+                if pattern in token:
+                    matches |= positions
+            return matches
+        trigrams = self._trigrams[field]
+        size = self.NGRAM_SIZE
+        candidates: set[int] | None = None
+        for start in range(len(pattern) - size + 1):
+            postings = trigrams.get(pattern[start : start + size])
+            if not postings:
+                return set()
+            candidates = set(postings) if candidates is None else candidates & postings
+        return candidates
+
+    def ediarum_id_positions(self, ediarum_id: str) -> list[int]:
+        """Return the positions of all features with the given Ediarum-ID."""
+        if not self._folded:
+            self.build_search_index()
+        return self._by_ediarum_id.get(ediarum_id, [])
+
+    def bbox_positions(
+        self,
+        min_lon: float,
+        min_lat: float,
+        max_lon: float,
+        max_lat: float,
+    ) -> list[int]:
+        """Return positions of features located inside a bounding box.
+
+        Features without coordinates are never included, since comparisons
+        with their NaN placeholders are always false.
+
+        Args:
+            min_lon: Western boundary (inclusive)
+            min_lat: Southern boundary (inclusive)
+            max_lon: Eastern boundary (inclusive)
+            max_lat: Northern boundary (inclusive)
+
+        Returns:
+            Ascending feature positions
+        """
+        if not self._folded:
+            self.build_search_index()
+        return [
+            i
+            for i, (lon, lat) in enumerate(zip(self._longitudes, self._latitudes, strict=True))
+            if min_lon <= lon <= max_lon and min_lat <= lat <= max_lat
+        ]
+
     def get_by_ediarum_id(self, ediarum_id: str) -> list[GeoJSONFeature]:
         """Find all entries with matching Ediarum-ID."""
-        return [f for f in self.features if f.properties.ediarum_id == ediarum_id]
+        return [self.features[i] for i in self.ediarum_id_positions(ediarum_id)]
 
     def get_by_name(
         self,
@@ -22,8 +22,10 @@ Datensammlungen:
 Tools:
 - search_documents, browse_documents, get_document - Document search and retrieval
 - search_register, get_register_entry - Register (people, places, institutions) search
-- search_biogramme, get_biogramm_by_id, extract_family_network - Detailed biographical entries
-- get_residential_topography, search_residential_addresses - Historical address data
+- search_biogramme, get_biogramm_by_id, extract_family_network,
+  batch_extract_family_networks - Detailed biographical entries
+- get_residential_topography, search_residential_addresses,
+  search_residential_by_bbox - Historical address data
 - search_adjutanten_journals, get_adjutanten_journal_entry, list_adjutanten_by_monarch - Court journals
 """
 
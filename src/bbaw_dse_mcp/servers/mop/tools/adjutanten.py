@@ -11,13 +11,18 @@ Available monarchs:
 - Friedrich_III (1888)
 """
 
+import asyncio
 from collections.abc import Callable, Coroutine
+from datetime import date
+from functools import lru_cache
+import re
 from typing import Any
-from xml.etree import ElementTree as ET
 
 from fastmcp import Context, FastMCP
 from fastmcp.exceptions import ToolError
+from lxml import etree
 
+from bbaw_dse_mcp.utils.cache import TTLCache
 from bbaw_dse_mcp.utils.existdb import ExistDBClient
 
 # Type alias for client getter
@@ -31,9 +36,311 @@ AVAILABLE_MONARCHS = [
     "Friedrich_III",
 ]
 
+# Lowercased monarch names for matching against document IDs
+_MONARCH_LC = [(m.lower(), m) for m in AVAILABLE_MONARCHS]
+
+# Base collection of the journals (one subcollection per monarch)
+JOURNALS_PATH = "/db/projects/mop/data/Adjutantenjournale"
+
+# Online edition view for journal documents
+EDITION_DETAIL_URL = "https://actaborussica.bbaw.de/v.01/editiondetail"
+
+# Keys of a search result entry, in output order
+HIT_KEYS = (
+    "id",
+    "monarch",
+    "date_from",
+    "date_to",
+    "place",
+    "place_key",
+    "authors",
+    "snippet",
+    "url",
+)
+
 # TEI namespace
 NS = {"tei": "http://www.tei-c.org/ns/1.0"}
 
+# Maximum characters per paragraph in search result snippets
+SNIPPET_LENGTH = 200
+
+# Fixed TEI locations (relative to tei:TEI) used instead of descendant searches
+CREATION_DATE_PATH = "tei:teiHeader/tei:profileDesc/tei:creation/tei:date"
+SHELFMARK_PATH = (
+    "tei:teiHeader/tei:fileDesc/tei:sourceDesc/tei:msDesc/tei:msIdentifier"
+    "/tei:idno/tei:idno[@type='shelfmark']"
+)
+
+# Accepted format for register keys / document IDs
+KEY_PATTERN = re.compile(r"[A-Za-z0-9_]+")
+
+
+def _paragraph_text(p: etree._Element) -> str:
+    """Return the stripped text content of a paragraph element.
+
+    Paragraphs without child elements (the common case in journal text) are
+    read directly from ``.text`` without serializing.
+    """
+    if len(p) == 0:
+        return (p.text or "").strip()
+    return str(etree.tostring(p, method="text", with_tail=False, encoding="unicode")).strip()
+
+
+# Parsed journal documents for repeated get_adjutanten_journal_entry calls
+# Key: document ID, Value: tei:TEI element
+DOC_CACHE_SIZE = 32
+DOC_CACHE_TTL = 3600.0
+_doc_cache: TTLCache[str, etree._Element] = TTLCache(DOC_CACHE_SIZE, DOC_CACHE_TTL)
+
+# XQuery sequence literal of all monarch subcollections
+_MONARCH_SEQUENCE = ", ".join(f"'{m}'" for m in AVAILABLE_MONARCHS)
+
+# Journal documents are stored as {JOURNALS_PATH}/{monarch}/{xml:id}.xml, so
+# the entry is opened directly via doc() for each monarch. Non-existent paths
+# cost nothing; the collection scan only runs if no file matches.
+ENTRY_XQUERY = f"""
+declare namespace tei="http://www.tei-c.org/ns/1.0";
+declare variable $document-id external;
+
+let $direct :=
+    for $monarch in ({_MONARCH_SEQUENCE})
+    let $path := concat('{JOURNALS_PATH}/', $monarch, '/', $document-id, '.xml')
+    where doc-available($path)
+    return doc($path)/tei:TEI
+return
+    if (exists($direct))
+    then $direct[1]
+    else collection('{JOURNALS_PATH}')//tei:TEI[@xml:id = $document-id]
+"""
+
+
+def _monarch_from_id(doc_id: str) -> str | None:
+    """Determine the monarch from a document ID, if it names one."""
+    doc_id_lc = doc_id.lower()
+    for monarch_lc, monarch in _MONARCH_LC:
+        if monarch_lc in doc_id_lc:
+            return monarch
+    return None
+
+
+def _extract_days(doc: etree._Element) -> list[dict[str, Any]]:
+    """Extract the daily entries with their writing sessions from a journal.
+
+    Args:
+        doc: tei:TEI element of a journal document
+
+    Returns:
+        List of dicts with date, place and sessions (author and text)
+    """
+    days: list[dict[str, Any]] = []
+    days_append = days.append
+    for day_div in doc.iterfind("tei:text/tei:body//tei:div[@type='tag']", NS):
+        dateline = day_div.find(".//tei:dateline", NS)
+        if dateline is None:
+            continue
+
+        # Bind lookup methods once per element for the repeated calls below
+        dateline_find = dateline.find
+        date_elem = dateline_find(".//tei:date", NS)
+        day_date = date_elem.get("when") if date_elem is not None else None
+
+        place_elem = dateline_find(".//tei:placeName", NS)
+        day_place = place_elem.text if place_elem is not None else None
+
+        # Extract authors and text by writing session
+        sessions: list[dict[str, str]] = []
+        sessions_append = sessions.append
+        for session in day_div.iterfind(".//tei:div[@type='writingSession']", NS):
+            author_elem = session.find(".//tei:ab[@type='author']/tei:persName", NS)
+            author = author_elem.text if author_elem is not None else "Unknown"
+
+            # Get all paragraph text
+            paragraphs = [
+                text
+                for p in session.iterfind(".//tei:p", NS)
+                if (text := _paragraph_text(p))
+            ]
+
+            sessions_append({"author": author.strip(), "text": "\n\n".join(paragraphs)})
+
+        days_append({"date": day_date, "place": day_place, "sessions": sessions})
+
+    return days
+
+
+def _validate_key(name: str, value: str | None) -> None:
+    """Reject register keys and document IDs with unexpected characters.
+
+    Raises:
+        ToolError: If the value is set but not a plain alphanumeric key
+    """
+    if value is not None and not KEY_PATTERN.fullmatch(value):
+        raise ToolError(f"Invalid {name} '{value}'. Expected an ID like 'P0002157'")
+
+
+def _validate_date(name: str, value: str | None) -> None:
+    """Reject values that are not a valid calendar date in ISO format (YYYY-MM-DD).
+
+    Only the extended YYYY-MM-DD form is accepted, not the other ISO 8601
+    forms fromisoformat() understands (e.g. YYYYMMDD), since the search
+    XQuery casts the value with xs:date().
+
+    Raises:
+        ToolError: If the value is set but not an ISO date
+    """
+    if value is None:
+        return
+    try:
+        valid = date.fromisoformat(value).isoformat() == value
+    except ValueError:
+        valid = False
+    if not valid:
+        raise ToolError(f"Invalid {name} '{value}'. Use ISO format (YYYY-MM-DD)")
+
+
+@lru_cache(maxsize=64)
+def _build_search_xquery(
+    monarch: str | None,
+    *,
+    has_query: bool,
+    has_date_from: bool,
+    has_date_to: bool,
+    has_person: bool,
+    has_place: bool,
+) -> str:
+    """Build the journal search XQuery for a given filter combination.
+
+    Filter values are not part of the query text; they are bound as external
+    variables ($query, $date-from, $date-to, $person-key, $place-key). The
+    source is therefore identical for every call with the same filter shape,
+    which lets both this cache and eXist's compiled query pool hit.
+
+    Instead of whole TEI documents the query returns one small <hit> element
+    per match carrying only the fields the search result needs, with the
+    snippet already truncated server-side.
+
+    Args:
+        monarch: Restrict to a monarch's subcollection (validated by caller)
+        has_query: Whether a full-text query is bound
+        has_date_from: Whether a start date is bound
+        has_date_to: Whether an end date is bound
+        has_person: Whether a person key is bound
+        has_place: Whether a place key is bound
+
+    Returns:
+        XQuery source text
+    """
+    declarations = []
+    # All filters are combined into a single predicate on tei:TEI so eXist's
+    # optimizer treats them uniformly
+    conditions = []
+
+    # Path filter by monarch
+    path = f"{JOURNALS_PATH}/{monarch}" if monarch else JOURNALS_PATH
+
+    # Full-text query
+    if has_query:
+        declarations.append("declare variable $query external;")
+        conditions.append("ft:query(., $query)")
+
+    # Date range filter (overlap test). Not every journal carries full ISO
+    # dates in @from/@to (some are empty or partial, e.g. "1850-05"), so the
+    # xs:date casts are guarded with "castable as"; such journals are left
+    # out of a date-filtered search instead of failing it with a dynamic
+    # error. The guard may keep eXist from using a range index on the
+    # creation date, which otherwise would be declared in the collection.xconf
+    # of the Adjutantenjournale collection:
+    #   <range>
+    #       <create qname="tei:date">
+    #           <field name="date-from" match="@from" type="xs:date"/>
+    #           <field name="date-to" match="@to" type="xs:date"/>
+    #       </create>
+    #   </range>
+    date_conditions = []
+    if has_date_from:
+        declarations.append("declare variable $date-from external;")
+        date_conditions.append(
+            "@to castable as xs:date and xs:date(@to) ge xs:date($date-from)"
+        )
+    if has_date_to:
+        declarations.append("declare variable $date-to external;")
+        date_conditions.append(
+            "@from castable as xs:date and xs:date(@from) le xs:date($date-to)"
+        )
+    if date_conditions:
+        conditions.append(f"{CREATION_DATE_PATH}[{' and '.join(date_conditions)}]")
+
+    # Person filter
+    if has_person:
+        declarations.append("declare variable $person-key external;")
+        conditions.append(".//tei:persName[@key = $person-key]")
+
+    # Place filter
+    if has_place:
+        declarations.append("declare variable $place-key external;")
+        conditions.append(".//tei:placeName[@key = $place-key]")
+
+    # Combine conditions
+    filter_expr = f"[{' and '.join(conditions)}]" if conditions else ""
+
+    return f"""
+    declare namespace tei="http://www.tei-c.org/ns/1.0";
+    {" ".join(declarations)}
+
+    for $doc in collection('{path}')//tei:TEI{filter_expr}
+    let $date := $doc/{CREATION_DATE_PATH}[1]
+    let $body := $doc/tei:text/tei:body
+    let $place := ($body//tei:dateline/tei:placeName)[1]
+    order by $date/@from
+    return
+        <hit id="{{$doc/@xml:id}}" from="{{$date/@from}}" to="{{$date/@to}}">{{
+            if ($place) then <place key="{{$place/@key}}">{{$place/text()}}</place> else (),
+            for $author in $body//tei:ab[@type='author']/tei:persName
+            return <author>{{$author/text()}}</author>,
+            for $p in ($body//tei:div[@type='journalText']//tei:p)[position() le 2]
+            let $text := normalize-space($p)
+            where $text
+            return <snip>{{
+                if (string-length($text) gt {SNIPPET_LENGTH})
+                then concat(substring($text, 1, {SNIPPET_LENGTH}), '...')
+                else $text
+            }}</snip>
+        }}</hit>
+    """
+
+
+@lru_cache(maxsize=len(AVAILABLE_MONARCHS))
+def _build_adjutants_xquery(monarch: str) -> str:
+    """Build the XQuery listing all adjutants of a monarch's journals."""
+    path = f"{JOURNALS_PATH}/{monarch}"
+    return f"""
+    declare namespace tei="http://www.tei-c.org/ns/1.0";
+
+    for $author in distinct-values(
+        collection('{path}')//tei:ab[@type='author']/tei:persName/@key
+    )
+    let $name := collection('{path}')
+        //tei:ab[@type='author']/tei:persName[@key=$author][1]/text()
+    let $entries := collection('{path}')
+        //tei:ab[@type='author']/tei:persName[@key=$author]
+    let $dates := for $entry in $entries
+        return $entry/ancestor::tei:div[@type='tag']//tei:dateline/tei:date/@when
+    let $min_date := min($dates)
+    let $max_date := max($dates)
+    order by $name
+    return <adjutant key="{{$author}}" name="{{$name}}" count="{{count($entries)}}"
+                     min_date="{{$min_date}}" max_date="{{$max_date}}"/>
+    """
+
+
+@lru_cache(maxsize=len(AVAILABLE_MONARCHS))
+def _build_count_xquery(monarch: str) -> str:
+    """Build the XQuery counting a monarch's journal documents."""
+    return f"""
+    declare namespace tei="http://www.tei-c.org/ns/1.0";
+    count(collection('{JOURNALS_PATH}/{monarch}')//tei:TEI)
+    """
+
 
 def register_adjutanten_tools(
     mcp: FastMCP,
@@ -90,7 +397,7 @@ def register_adjutanten_tools(
             - monarch: Which monarch's reign
             - date_from/date_to: Time range covered
             - place: Where the court was located
-            - authors: Adjutants who wrote the entry
+            - authors: Adjutants who wrote the entry (unique, sorted)
             - snippet: Text excerpt showing matched content
             - url: Link to full entry on website
 
@@ -102,126 +409,104 @@ def register_adjutanten_tools(
                 f"Invalid monarch '{monarch}'. Available: {', '.join(AVAILABLE_MONARCHS)}"
             )
 
+        # Validate inputs before any round trip to the database
+        _validate_date("date_from", date_from)
+        _validate_date("date_to", date_to)
+        _validate_key("person_key", person_key)
+        _validate_key("place_key", place_key)
+
         if ctx:
             await ctx.info("Searching Adjutantenjournale...")
 
         client = await get_client()
 
-        # Build XQuery
-        conditions = []
-
-        # Path filter by monarch
-        if monarch:
-            path = f"'/db/projects/mop/data/Adjutantenjournale/{monarch}'"
-        else:
-            path = "'/db/projects/mop/data/Adjutantenjournale'"
-
-        # Full-text query
+        # Bind filter values as external variables; the query text only
+        # depends on which filters are set
+        variables: dict[str, str] = {}
         if query:
-            conditions.append(f".[ft:query(., '{query}')]")
-
-        # Date range filter
-        date_conditions = []
+            variables["query"] = query
         if date_from:
-            date_conditions.append(f"@to >= '{date_from}'")
+            variables["date-from"] = date_from
         if date_to:
-            date_conditions.append(f"@from <= '{date_to}'")
-        if date_conditions:
-            conditions.append(
-                f".//tei:creation/tei:date[{' and '.join(date_conditions)}]"
-            )
-
-        # Person filter
+            variables["date-to"] = date_to
         if person_key:
-            conditions.append(f".//tei:persName[@key='{person_key}']")
-
-        # Place filter
+            variables["person-key"] = person_key
         if place_key:
-            conditions.append(f".//tei:placeName[@key='{place_key}']")
-
-        # Combine conditions
-        filter_expr = "".join(f"[{cond}]" for cond in conditions) if conditions else ""
-
-        xquery = f"""
-        declare namespace tei="http://www.tei-c.org/ns/1.0";
-
-        for $doc in collection({path})//tei:TEI{filter_expr}
-        let $date_from := $doc//tei:creation/tei:date/@from
-        let $date_to := $doc//tei:creation/tei:date/@to
-        let $id := $doc/@xml:id
-        order by $date_from
-        return $doc
-        """
+            variables["place-key"] = place_key
+
+        xquery = _build_search_xquery(
+            monarch,
+            has_query=bool(query),
+            has_date_from=bool(date_from),
+            has_date_to=bool(date_to),
+            has_person=bool(person_key),
+            has_place=bool(place_key),
+        )
 
         try:
-            result_xml = await client.execute_xquery(xquery)
-            root = ET.fromstring(f"<results>{result_xml}</results>")
+            result_xml = await client.execute_xquery(
+                xquery, how_many=limit, variables=variables
+            )
+            root = await asyncio.to_thread(
+                etree.fromstring, f"<results>{result_xml}</results>"
+            )
 
             results = []
-            for doc in root.findall(".//tei:TEI", NS)[:limit]:
-                doc_id = doc.get("{http://www.w3.org/XML/1998/namespace}id", "unknown")
+            for hit in root.findall("hit")[:limit]:
+                doc_id = hit.get("id") or "unknown"
 
                 # Extract metadata
-                date_elem = doc.find(".//tei:creation/tei:date", NS)
-                date_from_val = date_elem.get("from") if date_elem is not None else None
-                date_to_val = date_elem.get("to") if date_elem is not None else None
+                date_from_val = hit.get("from") or None
+                date_to_val = hit.get("to") or None
 
                 # Determine monarch from path/ID
-                monarch_val = None
-                if monarch:
-                    monarch_val = monarch
-                else:
-                    # Try to determine from document structure
-                    for m in AVAILABLE_MONARCHS:
-                        if doc_id and m.lower() in doc_id.lower():
-                            monarch_val = m
-                            break
+                monarch_val = monarch or _monarch_from_id(doc_id)
 
                 # Extract place (first dateline place)
-                place_elem = doc.find(".//tei:dateline/tei:placeName", NS)
+                place_elem = hit.find("place")
                 place = place_elem.text if place_elem is not None else None
                 place_key_val = (
-                    place_elem.get("key") if place_elem is not None else None
+                    place_elem.get("key") or None if place_elem is not None else None
                 )
 
-                # Extract authors (adjutants on duty)
-                authors = []
-                for author_elem in doc.findall(
-                    ".//tei:ab[@type='author']/tei:persName", NS
-                ):
-                    author_name = author_elem.text or ""
-                    authors.append(author_name.strip())
-
-                # Extract snippet
-                snippet_parts = []
-                for p in doc.findall(".//tei:div[@type='journalText']//tei:p", NS)[:2]:
-                    text = "".join(p.itertext()).strip()
-                    if text:
-                        snippet_parts.append(
-                            text[:200] + "..." if len(text) > 200 else text
-                        )
-                snippet = " | ".join(snippet_parts)
-
-                results.append(
+                # Extract authors (adjutants on duty), one entry per person
+                authors = sorted(
                     {
-                        "id": doc_id,
-                        "monarch": monarch_val,
-                        "date_from": date_from_val,
-                        "date_to": date_to_val,
-                        "place": place,
-                        "place_key": place_key_val,
-                        "authors": authors,
-                        "snippet": snippet,
-                        "url": f"https://actaborussica.bbaw.de/v.01/editiondetail/{doc_id}",
+                        name
+                        for author_elem in hit.findall("author")
+                        if (name := (author_elem.text or "").strip())
                     }
                 )
 
+                # Snippets are already truncated by the query
+                snippet = " | ".join(s.text for s in hit.findall("snip") if s.text)
+
+                results.append(
+                    dict(
+                        zip(
+                            HIT_KEYS,
+                            (
+                                doc_id,
+                                monarch_val,
+                                date_from_val,
+                                date_to_val,
+                                place,
+                                place_key_val,
+                                authors,
+                                snippet,
+                                f"{EDITION_DETAIL_URL}/{doc_id}",
+                            ),
+                            strict=True,
+                        )
+                    )
+                )
+
             if ctx:
                 await ctx.info(f"Found {len(results)} journal entries")
 
             return results
 
-        except ET.ParseError as e:
+        except etree.XMLSyntaxError as e:
             raise ToolError(f"Failed to parse XML results: {e}") from e
         except Exception as e:
             raise ToolError(f"Search failed: {e}") from e
@@ -264,79 +549,40 @@ def register_adjutanten_tools(
         Raises:
             ToolError: If document not found or retrieval fails
         """
+        _validate_key("document_id", document_id)
+
         if ctx:
             await ctx.info(f"Retrieving journal entry {document_id}...")
 
-        client = await get_client()
-
-        xquery = f"""
-        declare namespace tei="http://www.tei-c.org/ns/1.0";
-
-        collection('/db/projects/mop/data/Adjutantenjournale')//tei:TEI[@xml:id='{document_id}']
-        """
-
         try:
-            result_xml = await client.execute_xquery(xquery)
-            root = ET.fromstring(f"<results>{result_xml}</results>")
-
-            doc = root.find(".//tei:TEI", NS)
+            doc = _doc_cache.get(document_id)
             if doc is None:
-                raise ToolError(f"Journal entry '{document_id}' not found")
+                client = await get_client()
+                result_xml = await client.execute_xquery(
+                    ENTRY_XQUERY, variables={"document-id": document_id}
+                )
+                root = await asyncio.to_thread(
+                    etree.fromstring, f"<results>{result_xml}</results>"
+                )
+
+                doc = root.find("tei:TEI", NS)
+                if doc is None:
+                    raise ToolError(f"Journal entry '{document_id}' not found")
+                _doc_cache.set(document_id, doc)
 
             # Extract metadata
-            date_elem = doc.find(".//tei:creation/tei:date", NS)
+            date_elem = doc.find(CREATION_DATE_PATH, NS)
             date_from = date_elem.get("from") if date_elem is not None else None
             date_to = date_elem.get("to") if date_elem is not None else None
 
-            shelfmark_elem = doc.find(
-                ".//tei:msIdentifier/tei:idno/tei:idno[@type='shelfmark']", NS
-            )
+            shelfmark_elem = doc.find(SHELFMARK_PATH, NS)
             shelfmark = shelfmark_elem.text if shelfmark_elem is not None else None
 
             # Determine monarch
-            monarch_val = None
-            for m in AVAILABLE_MONARCHS:
-                if document_id and m.lower() in document_id.lower():
-                    monarch_val = m
-                    break
-
-            # Extract daily entries
-            days = []
-            for day_div in doc.findall(".//tei:div[@type='tag']", NS):
-                dateline = day_div.find(".//tei:dateline", NS)
-                if dateline is None:
-                    continue
-
-                date_elem = dateline.find(".//tei:date", NS)
-                day_date = date_elem.get("when") if date_elem is not None else None
-
-                place_elem = dateline.find(".//tei:placeName", NS)
-                day_place = place_elem.text if place_elem is not None else None
-
-                # Extract authors and text by writing session
-                sessions = []
-                for session in day_div.findall(
-                    ".//tei:div[@type='writingSession']", NS
-                ):
-                    author_elem = session.find(
-                        ".//tei:ab[@type='author']/tei:persName", NS
-                    )
-                    author = author_elem.text if author_elem is not None else "Unknown"
+            monarch_val = _monarch_from_id(document_id)
 
-                    # Get all paragraph text
-                    paragraphs = []
-                    for p in session.findall(".//tei:p", NS):
-                        text = "".join(p.itertext()).strip()
-                        if text:
-                            paragraphs.append(text)
-
-                    sessions.append(
-                        {"author": author.strip(), "text": "\n\n".join(paragraphs)}
-                    )
-
-                days.append(
-                    {"date": day_date, "place": day_place, "sessions": sessions}
-                )
+            # Extract daily entries off the event loop (pure Python tree walk)
+            days = await asyncio.to_thread(_extract_days, doc)
 
             result = {
                 "id": document_id,
@@ -345,7 +591,7 @@ def register_adjutanten_tools(
                 "date_to": date_to,
                 "shelfmark": shelfmark,
                 "days": days,
-                "url": f"https://actaborussica.bbaw.de/v.01/editiondetail/{document_id}",
+                "url": f"{EDITION_DETAIL_URL}/{document_id}",
             }
 
             if ctx:
@@ -353,7 +599,7 @@ def register_adjutanten_tools(
 
             return result
 
-        except ET.ParseError as e:
+        except etree.XMLSyntaxError as e:
             raise ToolError(f"Failed to parse document: {e}") from e
         except Exception as e:
             raise ToolError(f"Retrieval failed: {e}") from e
@@ -403,29 +649,13 @@ def register_adjutanten_tools(
 
         client = await get_client()
 
-        xquery = f"""
-        declare namespace tei="http://www.tei-c.org/ns/1.0";
-
-        for $author in distinct-values(
-            collection('/db/projects/mop/data/Adjutantenjournale/{monarch}')
-            //tei:ab[@type='author']/tei:persName/@key
-        )
-        let $name := collection('/db/projects/mop/data/Adjutantenjournale/{monarch}')
-            //tei:ab[@type='author']/tei:persName[@key=$author][1]/text()
-        let $entries := collection('/db/projects/mop/data/Adjutantenjournale/{monarch}')
-            //tei:ab[@type='author']/tei:persName[@key=$author]
-        let $dates := for $entry in $entries
-            return $entry/ancestor::tei:div[@type='tag']//tei:dateline/tei:date/@when
-        let $min_date := min($dates)
-        let $max_date := max($dates)
-        order by $name
-        return <adjutant key="{{$author}}" name="{{$name}}" count="{{count($entries)}}"
-                         min_date="{{$min_date}}" max_date="{{$max_date}}"/>
-        """
+        xquery = _build_adjutants_xquery(monarch)
 
         try:
             result_xml = await client.execute_xquery(xquery)
-            root = ET.fromstring(f"<results>{result_xml}</results>")
+            root = await asyncio.to_thread(
+                etree.fromstring, f"<results>{result_xml}</results>"
+            )
 
             adjutants = []
             for adj in root.findall(".//adjutant"):
@@ -442,11 +672,7 @@ def register_adjutanten_tools(
                 )
 
             # Get total entries count
-            count_query = f"""
-            declare namespace tei="http://www.tei-c.org/ns/1.0";
-            count(collection('/db/projects/mop/data/Adjutantenjournale/{monarch}')//tei:TEI)
-            """
-            total = await client.execute_xquery(count_query)
+            total = await client.execute_xquery(_build_count_xquery(monarch))
 
             result = {
                 "monarch": monarch,
@@ -460,7 +686,7 @@ def register_adjutanten_tools(
 
             return result
 
-        except ET.ParseError as e:
+        except etree.XMLSyntaxError as e:
             raise ToolError(f"Failed to parse results: {e}") from e
         except Exception as e:
             raise ToolError(f"Query failed: {e}") from e
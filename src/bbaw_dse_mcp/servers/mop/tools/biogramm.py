@@ -1,25 +1,263 @@
 """Biogramm tools for detailed biographical entries in MoP."""
 
-import json
-import logging
+import asyncio
 from collections.abc import Callable, Coroutine
+import logging
 from typing import Any
-from xml.etree import ElementTree as ET
 
 from fastmcp import Context, FastMCP
 from fastmcp.exceptions import ToolError
+from lxml import etree
 
 from bbaw_dse_mcp.config.base import settings
+from bbaw_dse_mcp.utils import jsonlib
+from bbaw_dse_mcp.utils.cache import TTLCache
 from bbaw_dse_mcp.utils.existdb import ExistDBClient
 
 # Namespace constants
 NS = {"tei": "http://www.tei-c.org/ns/1.0"}
 
+# Clark-notation TEI tags, so hot loops can use iter() and find() without
+# XPath parsing or prefix resolution
+_TEI = f"{{{NS['tei']}}}"
+_Q = {
+    name: _TEI + name
+    for name in ("div", "relation", "desc", "item", "title", "titleStmt")
+}
+
 logger = logging.getLogger(__name__)
 
 # Type alias for client getter
 ClientGetter = Callable[[], Coroutine[Any, Any, ExistDBClient]]
 
+# Collection holding the biogramm TEI documents
+BIOGRAMME_PATH = f"{settings.ab_db_path}/Biogramme"
+
+# Empty year strings disable the corresponding filter.
+SEARCH_XQUERY = f"""
+xquery version "3.1";
+declare namespace tei="http://www.tei-c.org/ns/1.0";
+declare namespace ft="http://exist-db.org/xquery/lucene";
+declare variable $query external;
+declare variable $birth-year external;
+declare variable $death-year external;
+declare variable $max-results external;
+
+(: ft:query runs directly on the indexed name divs so the Lucene index is
+   used; the year filters then only touch the matching biogramme :)
+let $matches := collection('{BIOGRAMME_PATH}')//tei:div[@type='name'][ft:query(., $query)]
+let $hits := $matches/ancestor::tei:TEI
+let $hits :=
+    if ($birth-year = '') then $hits
+    else $hits[.//tei:div[@type='birth'][contains(., $birth-year)]]
+let $hits :=
+    if ($death-year = '') then $hits
+    else $hits[.//tei:div[@type='death'][contains(., $death-year)]]
+let $results := array {{
+    for $hit in subsequence($hits, 1, $max-results)
+    let $name := $hit//tei:div[@type='name']//tei:persName/normalize-space(.)
+    let $birth := $hit//tei:div[@type='birth']/normalize-space(.)
+    let $death := $hit//tei:div[@type='death']/normalize-space(.)
+    let $gnd := $hit//tei:div[@type='gnd']/normalize-space(.)
+    let $person-id := $hit//tei:div[@type='name']//tei:persName/@key/string()
+    return map {{
+        "id": $hit/@xml:id/string(),
+        "person_id": $person-id,
+        "name": $name,
+        "birth": $birth,
+        "death": $death,
+        "gnd": $gnd
+    }}
+}}
+return serialize($results, map {{ "method": "json" }})
+"""
+
+BIOGRAMM_XQUERY = f"""
+xquery version "3.1";
+declare namespace tei="http://www.tei-c.org/ns/1.0";
+declare variable $biogramm-id external;
+
+(: An unknown ID serializes the empty sequence to an empty string :)
+let $biogramm := collection('{BIOGRAMME_PATH}')//tei:TEI[@xml:id = $biogramm-id]
+return serialize($biogramm, map {{ "method": "xml", "indent": true() }})
+"""
+
+FAMILY_XQUERY = f"""
+xquery version "3.1";
+declare namespace tei="http://www.tei-c.org/ns/1.0";
+declare variable $biogramm-id external;
+
+(: Iterating the match yields nothing at all for an unknown ID :)
+for $biogramm in collection('{BIOGRAMME_PATH}')//tei:TEI[@xml:id = $biogramm-id]
+return serialize(map {{
+    "name": normalize-space(($biogramm//tei:div[@type='name'])[1]),
+    "family_relations": array {{
+        for $relation in ($biogramm//tei:div[@type='relatives'])[1]//tei:relation
+        let $desc := normalize-space(($relation//tei:desc)[1])
+        where $desc != ''
+        return map {{
+            "relation": ($relation/@name/string(), "unknown")[1],
+            "description": $desc
+        }}
+    }}
+}}, map {{ "method": "json" }})
+"""
+
+# Family network group for each relation type; other types are kept as
+# "other_relations" together with their type
+RELATION_BUCKETS = {
+    "father": "parents",
+    "mother": "parents",
+    "brother": "siblings",
+    "sister": "siblings",
+    "wife": "spouse",
+    "husband": "spouse",
+    "spouse": "spouse",
+    "son": "children",
+    "daughter": "children",
+    "child": "children",
+}
+
+# Maximum number of concurrent eXist-db requests of a batch tool call
+BATCH_CONCURRENCY = 16
+
+# Maximum number of distinct biogramm IDs per batch tool call
+MAX_BATCH_SIZE = 200
+
+# LRU cache of fetched biogramm XML, keyed by biogramm ID. Biogramme are
+# rarely edited, so a short TTL is enough to pick up changes.
+BIOGRAMM_CACHE_SIZE = 512
+BIOGRAMM_CACHE_TTL = 300.0
+_biogramm_cache: TTLCache[str, bytes] = TTLCache(BIOGRAMM_CACHE_SIZE, BIOGRAMM_CACHE_TTL)
+
+# LRU cache of the projected family JSON (FAMILY_XQUERY), keyed by biogramm
+# ID, shared by extract_family_network and batch_extract_family_networks.
+# The serialized JSON is kept, so every hit decodes a fresh dict.
+_family_cache: TTLCache[str, bytes] = TTLCache(BIOGRAMM_CACHE_SIZE, BIOGRAMM_CACHE_TTL)
+
+
+def _text(elem: etree._Element) -> str:
+    """Return the stripped text content of an element."""
+    return "".join(elem.itertext()).strip()
+
+
+def _title(root: etree._Element) -> str:
+    """Return the title of the first titleStmt, or an empty string."""
+    for title_stmt in root.iter(_Q["titleStmt"]):
+        title = title_stmt.find(_Q["title"])
+        if title is not None and title.text is not None:
+            return str(title.text)
+    return ""
+
+
+def _index_divs(root: etree._Element) -> dict[str, etree._Element]:
+    """Map each biogramm div type to its first div in a single tree walk."""
+    divs_by_type: dict[str, etree._Element] = {}
+    for div in root.iter(_Q["div"]):
+        div_type = div.get("type")
+        if div_type is not None:
+            divs_by_type.setdefault(div_type, div)
+    return divs_by_type
+
+
+def _organize_family_network(biogramm_data: dict) -> dict:
+    """Group the family relations of a biogramm by relation type."""
+    # Organize relations by type
+    family_network = {
+        "person": biogramm_data.get("name", ""),
+        "parents": [],
+        "siblings": [],
+        "spouse": [],
+        "children": [],
+        "other_relations": [],
+    }
+
+    for relation in biogramm_data.get("family_relations", []):
+        rel_type = relation["relation"]
+        desc = relation["description"]
+
+        bucket = RELATION_BUCKETS.get(rel_type)
+        if bucket is not None:
+            family_network[bucket].append(desc)
+        else:
+            family_network["other_relations"].append(
+                {"type": rel_type, "description": desc}
+            )
+
+    return family_network
+
+
+async def _fetch_biogramm_xml(get_client: ClientGetter, biogramm_id: str) -> bytes:
+    """Fetch the serialized TEI of a biogramm, using the module cache."""
+    cached = _biogramm_cache.get(biogramm_id)
+    if cached is not None:
+        return cached
+
+    client = await get_client()
+
+    xml_result = await client.execute_xquery_bytes(
+        BIOGRAMM_XQUERY, variables={"biogramm-id": biogramm_id}
+    )
+    if xml_result.strip():
+        _biogramm_cache.set(biogramm_id, xml_result)
+    return xml_result
+
+
+async def _fetch_family_data(get_client: ClientGetter, biogramm_id: str) -> dict:
+    """Fetch the name and family relations of a biogramm.
+
+    Only the name and the family relations are projected server-side and
+    returned as JSON, so the full TEI is neither transferred nor parsed.
+    The JSON is cached per biogramm ID.
+
+    Raises:
+        ToolError: If the biogramm does not exist
+    """
+    result_json = _family_cache.get(biogramm_id)
+    if result_json is None:
+        client = await get_client()
+
+        result_json = await client.execute_xquery_bytes(
+            FAMILY_XQUERY, variables={"biogramm-id": biogramm_id}
+        )
+        if not result_json.strip():
+            raise ToolError(f"Biogramm {biogramm_id} nicht gefunden")
+        _family_cache.set(biogramm_id, result_json)
+
+    family_data: dict = jsonlib.loads(result_json)
+    return family_data
+
+
+async def _fetch_family_networks(
+    get_client: ClientGetter, biogramm_ids: list[str]
+) -> dict[str, dict]:
+    """Fetch the family networks of several biogramme concurrently.
+
+    At most BATCH_CONCURRENCY requests run at once. A biogramm that fails
+    with an Exception gets an "error" entry instead of its network;
+    cancellation and other BaseExceptions abort the whole batch.
+    """
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    async def fetch(biogramm_id: str) -> dict:
+        async with semaphore:
+            return await _fetch_family_data(get_client, biogramm_id)
+
+    results = await asyncio.gather(
+        *(fetch(biogramm_id) for biogramm_id in biogramm_ids), return_exceptions=True
+    )
+
+    networks: dict[str, dict] = {}
+    for biogramm_id, result in zip(biogramm_ids, results, strict=True):
+        if isinstance(result, Exception):
+            logger.error(f"Error extracting family network for {biogramm_id}: {result}")
+            networks[biogramm_id] = {"error": str(result)}
+        elif isinstance(result, BaseException):
+            raise result
+        else:
+            networks[biogramm_id] = _organize_family_network(result)
+    return networks
+
 
 def register_biogramm_tools(
     mcp: FastMCP,
@@ -71,51 +309,17 @@ def register_biogramm_tools(
 
         client = await get_client()
 
-        # Build XQuery for biogramm search
-        birth_filter = (
-            f"and contains(.//tei:div[@type='birth']//text(), '{birth_year}')"
-            if birth_year
-            else ""
-        )
-        death_filter = (
-            f"and contains(.//tei:div[@type='death']//text(), '{death_year}')"
-            if death_year
-            else ""
-        )
-
-        xquery = f"""
-        xquery version "3.1";
-        declare namespace tei="http://www.tei-c.org/ns/1.0";
-        declare namespace ft="http://exist-db.org/xquery/lucene";
-
-        let $collection := collection('{settings.ab_db_path}/Biogramme')
-        let $hits := $collection//tei:TEI[
-            ft:query(.//tei:div[@type='name'], '{query}')
-            {birth_filter}
-            {death_filter}
-        ]
-        let $results := array {{
-            for $hit in subsequence($hits, 1, {max_results})
-            let $name := $hit//tei:div[@type='name']//tei:persName/normalize-space(.)
-            let $birth := $hit//tei:div[@type='birth']/normalize-space(.)
-            let $death := $hit//tei:div[@type='death']/normalize-space(.)
-            let $gnd := $hit//tei:div[@type='gnd']/normalize-space(.)
-            let $person-id := $hit//tei:div[@type='name']//tei:persName/@key/string()
-            return map {{
-                "id": $hit/@xml:id/string(),
-                "person_id": $person-id,
-                "name": $name,
-                "birth": $birth,
-                "death": $death,
-                "gnd": $gnd
-            }}
-        }}
-        return serialize($results, map {{ "method": "json" }})
-        """
-
         try:
-            result_json = await client.execute_xquery(xquery)
-            results = json.loads(result_json)
+            result_json = await client.execute_xquery_bytes(
+                SEARCH_XQUERY,
+                variables={
+                    "query": query,
+                    "birth-year": str(birth_year) if birth_year else "",
+                    "death-year": str(death_year) if death_year else "",
+                    "max-results": max_results,
+                },
+            )
+            results: list[dict] = jsonlib.loads(result_json)
             if ctx:
                 await ctx.info(f"Found {len(results)} biogramme")
             return results
@@ -150,61 +354,39 @@ def register_biogramm_tools(
         if ctx:
             await ctx.info(f"Retrieving biogramm: {biogramm_id}")
 
-        client = await get_client()
-
-        xquery = f"""
-        xquery version "3.1";
-        declare namespace tei="http://www.tei-c.org/ns/1.0";
-
-        let $biogramm := collection('{settings.ab_db_path}/Biogramme')//tei:TEI[@xml:id='{biogramm_id}']
-        return
-            if (exists($biogramm))
-            then serialize($biogramm, map {{ "method": "xml", "indent": true() }})
-            else ""
-        """
-
         try:
-            xml_result = await client.execute_xquery(xquery)
-            if not xml_result or xml_result.strip() == "":
+            xml_result = await _fetch_biogramm_xml(get_client, biogramm_id)
+            if not xml_result.strip():
                 raise ToolError(f"Biogramm {biogramm_id} nicht gefunden")
 
             # Parse XML and extract structured data
-            root = ET.fromstring(xml_result)
+            root = etree.fromstring(xml_result)
+            divs_by_type = _index_divs(root)
 
             # Helper function to extract div content
             def get_div_text(div_type: str) -> str:
                 """Extract text content from a div by type."""
-                div = root.find(f".//tei:div[@type='{div_type}']", NS)
+                div = divs_by_type.get(div_type)
                 if div is not None:
-                    return ET.tostring(div, encoding="unicode", method="text").strip()
+                    return _text(div)
                 return ""
 
             def get_div_list(div_type: str) -> list[str]:
                 """Extract list items from a div by type."""
-                div = root.find(f".//tei:div[@type='{div_type}']", NS)
+                div = divs_by_type.get(div_type)
                 if div is not None:
-                    items = div.findall(".//tei:item", NS)
-                    return [
-                        ET.tostring(item, encoding="unicode", method="text").strip()
-                        for item in items
-                        if item.text and item.text.strip()
-                    ]
+                    texts = (_text(item) for item in div.iter(_Q["item"]))
+                    return [text for text in texts if text]
                 return []
 
             # Extract family relations
-            relatives_div = root.find(".//tei:div[@type='relatives']", NS)
+            relatives_div = divs_by_type.get("relatives")
             family_relations = []
             if relatives_div is not None:
-                for relation in relatives_div.findall(".//tei:relation", NS):
+                for relation in relatives_div.iter(_Q["relation"]):
                     rel_type = relation.get("name", "unknown")
-                    desc_elem = relation.find(".//tei:desc", NS)
-                    desc = (
-                        ET.tostring(
-                            desc_elem, encoding="unicode", method="text"
-                        ).strip()
-                        if desc_elem is not None
-                        else ""
-                    )
+                    desc_elem = next(relation.iter(_Q["desc"]), None)
+                    desc = _text(desc_elem) if desc_elem is not None else ""
                     if desc:
                         family_relations.append(
                             {"relation": rel_type, "description": desc}
@@ -215,12 +397,7 @@ def register_biogramm_tools(
 
             biogramm_data = {
                 "id": biogramm_id,
-                "title": (
-                    root.find(".//tei:titleStmt/tei:title", NS).text
-                    if root.find(".//tei:titleStmt/tei:title", NS) is not None
-                    and root.find(".//tei:titleStmt/tei:title", NS).text is not None
-                    else ""
-                ),
+                "title": _title(root),
                 "name": get_div_text("name"),
                 "gender": get_div_text("gender"),
                 "birth": get_div_text("birth"),
@@ -243,63 +420,13 @@ def register_biogramm_tools(
 
             return biogramm_data
 
-        except ET.ParseError as e:
+        except etree.XMLSyntaxError as e:
             logger.error(f"Error parsing biogramm XML: {e}")
             raise ToolError(f"Fehler beim Parsen des Biogramms: {e}") from e
         except Exception as e:
             logger.error(f"Error retrieving biogramm: {e}")
             raise ToolError(f"Fehler beim Abrufen des Biogramms: {e}") from e
 
-    async def _get_biogramm_internal(biogramm_id: str) -> dict:
-        """Internal helper to get biogramm data without tool wrapper."""
-        client = await get_client()
-
-        xquery = f"""
-        xquery version "3.1";
-        declare namespace tei="http://www.tei-c.org/ns/1.0";
-
-        let $biogramm := collection('{settings.ab_db_path}/Biogramme')//tei:TEI[@xml:id='{biogramm_id}']
-        return
-            if (exists($biogramm))
-            then serialize($biogramm, map {{ "method": "xml", "indent": true() }})
-            else ""
-        """
-
-        xml_result = await client.execute_xquery(xquery)
-        if not xml_result or xml_result.strip() == "":
-            raise ToolError(f"Biogramm {biogramm_id} nicht gefunden")
-
-        # Parse XML and extract structured data
-        root = ET.fromstring(xml_result)  # noqa: S314
-
-        # Helper function to extract div content
-        def get_div_text(div_type: str) -> str:
-            """Extract text content from a div by type."""
-            div = root.find(f".//tei:div[@type='{div_type}']", NS)
-            if div is not None:
-                return ET.tostring(div, encoding="unicode", method="text").strip()
-            return ""
-
-        # Extract family relations
-        relatives_div = root.find(".//tei:div[@type='relatives']", NS)
-        family_relations = []
-        if relatives_div is not None:
-            for relation in relatives_div.findall(".//tei:relation", NS):
-                rel_type = relation.get("name", "unknown")
-                desc_elem = relation.find(".//tei:desc", NS)
-                desc = (
-                    ET.tostring(desc_elem, encoding="unicode", method="text").strip()
-                    if desc_elem is not None
-                    else ""
-                )
-                if desc:
-                    family_relations.append({"relation": rel_type, "description": desc})
-
-        return {
-            "name": get_div_text("name"),
-            "family_relations": family_relations,
-        }
-
     @mcp.tool
     async def extract_family_network(
         biogramm_id: str,
@@ -328,34 +455,9 @@ def register_biogramm_tools(
             await ctx.info(f"Extracting family network for: {biogramm_id}")
 
         # Get biogramm data
-        biogramm_data = await _get_biogramm_internal(biogramm_id)
-
-        # Organize relations by type
-        family_network = {
-            "person": biogramm_data.get("name", ""),
-            "parents": [],
-            "siblings": [],
-            "spouse": [],
-            "children": [],
-            "other_relations": [],
-        }
-
-        for relation in biogramm_data.get("family_relations", []):
-            rel_type = relation["relation"]
-            desc = relation["description"]
-
-            if rel_type in ["father", "mother"]:
-                family_network["parents"].append(desc)
-            elif rel_type in ["brother", "sister"]:
-                family_network["siblings"].append(desc)
-            elif rel_type in ["wife", "husband", "spouse"]:
-                family_network["spouse"].append(desc)
-            elif rel_type in ["son", "daughter", "child"]:
-                family_network["children"].append(desc)
-            else:
-                family_network["other_relations"].append(
-                    {"type": rel_type, "description": desc}
-                )
+        biogramm_data = await _fetch_family_data(get_client, biogramm_id)
+
+        family_network = _organize_family_network(biogramm_data)
 
         if ctx:
             total_relations = sum(
@@ -364,3 +466,48 @@ def register_biogramm_tools(
             await ctx.info(f"Found {total_relations} family relations")
 
         return family_network
+
+    @mcp.tool
+    async def batch_extract_family_networks(
+        biogramm_ids: list[str],
+        ctx: Context | None = None,
+    ) -> dict[str, dict]:
+        """Familiennetzwerke mehrerer Biogramme auf einmal extrahieren.
+
+        PURPOSE: Verwandtschaftsbeziehungen vieler Personen parallel abrufen
+
+        WHEN TO USE:
+        - Nach search_biogramme() für alle gefundenen Treffer
+        - Um Netzwerke ganzer Familien oder Hofstaaten zu vergleichen
+
+        WHEN NOT TO USE:
+        - Für ein einzelnes Biogramm → nutze extract_family_network()
+
+        Args:
+            biogramm_ids: XML-IDs der Biogramme (höchstens MAX_BATCH_SIZE)
+            ctx: FastMCP Context
+
+        Returns:
+            Dict von Biogramm-ID auf Familiennetzwerk; fehlgeschlagene
+            Abrufe enthalten stattdessen einen "error"-Eintrag
+        """
+        if not biogramm_ids:
+            raise ToolError("biogramm_ids ist erforderlich")
+
+        # Deduplicate while keeping the requested order
+        ids = list(dict.fromkeys(biogramm_ids))
+        if len(ids) > MAX_BATCH_SIZE:
+            raise ToolError(
+                f"Zu viele biogramm_ids ({len(ids)}), höchstens {MAX_BATCH_SIZE} pro Aufruf"
+            )
+
+        if ctx:
+            await ctx.info(f"Extracting family networks for {len(ids)} biogramme")
+
+        networks = await _fetch_family_networks(get_client, ids)
+
+        if ctx:
+            failed = sum(1 for network in networks.values() if "error" in network)
+            await ctx.info(f"Extracted {len(networks) - failed} family networks")
+
+        return networks
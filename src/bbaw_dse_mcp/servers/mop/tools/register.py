@@ -4,12 +4,13 @@ from collections.abc import Callable, Coroutine
 import json
 import logging
 from typing import Any
-from xml.etree import ElementTree as ET
 
 from fastmcp import Context, FastMCP
 from fastmcp.exceptions import ToolError
 
 from bbaw_dse_mcp.config.base import settings
+from bbaw_dse_mcp.utils import jsonlib
+from bbaw_dse_mcp.utils.cache import TTLCache
 from bbaw_dse_mcp.utils.existdb import ExistDBClient
 
 logger = logging.getLogger(__name__)
@@ -17,6 +18,77 @@ logger = logging.getLogger(__name__)
 # Type alias for client getter
 ClientGetter = Callable[[], Coroutine[Any, Any, ExistDBClient]]
 
+# Maximum lengths of the content and XML returned by get_register_entry
+MAX_CONTENT_LENGTH = 1000
+MAX_XML_LENGTH = 2000
+
+# LRU cache of register search results, keyed by the query as given,
+# register type and result limit. The query is not case-folded, since
+# Lucene query syntax is case-sensitive (e.g. AND/OR operators). Registers
+# change rarely, so a short TTL is enough to pick up edits.
+SEARCH_CACHE_SIZE = 1024
+SEARCH_CACHE_TTL = 300.0
+SearchKey = tuple[str, str, int]
+_search_cache: TTLCache[SearchKey, list[dict]] = TTLCache(SEARCH_CACHE_SIZE, SEARCH_CACHE_TTL)
+
+# Collection holding the register subcollections
+REGISTER_PATH = f"{settings.ab_db_path}/Register"
+
+SEARCH_XQUERY = f"""
+xquery version "3.1";
+declare namespace tei="http://www.tei-c.org/ns/1.0";
+declare namespace ft="http://exist-db.org/xquery/lucene";
+declare variable $query external;
+declare variable $register-type external;
+declare variable $max-results external;
+
+let $collection := collection('{REGISTER_PATH}/' || $register-type)
+(: ft:query comes first so the Lucene index selects the hits; ranking
+   happens before the cut-off so the best-scoring entries are returned :)
+let $hits := $collection//*[ft:query(., $query)][@xml:id]
+let $ranked :=
+    for $hit in $hits
+    order by ft:score($hit) descending
+    return $hit
+let $results := array {{
+    for $hit in subsequence($ranked, 1, $max-results)
+    (: Use the entry's name child as display name; only entries without one
+       fall back to joining all text outside notes :)
+    let $label := ($hit/(tei:persName | tei:placeName | tei:orgName | tei:title | tei:name))[1]
+    return map {{
+        "id": $hit/@xml:id/string(),
+        "name":
+            if (exists($label)) then normalize-space($label)
+            else normalize-space(string-join($hit//text()[not(parent::tei:note)], ' ')),
+        "type": $register-type,
+        "gnd": $hit/@corresp/string()
+    }}
+}}
+return serialize($results, map {{"method": "json"}})
+"""
+
+# Returns the entry's text, GND reference and XML as one JSON object, or
+# nothing if the entry does not exist. Text and XML are truncated
+# server-side so large entries are not transferred in full.
+ENTRY_XQUERY = f"""
+xquery version "3.1";
+declare namespace tei="http://www.tei-c.org/ns/1.0";
+declare variable $entry-id external;
+declare variable $register-type external;
+
+for $entry in (collection('{REGISTER_PATH}/' || $register-type)//*[@xml:id = $entry-id])[1]
+return serialize(map {{
+    "content": substring(normalize-space($entry), 1, {MAX_CONTENT_LENGTH}),
+    "gnd": ($entry/descendant-or-self::*[@corresp])[1]/@corresp/string(),
+    "xml": substring(serialize($entry), 1, {MAX_XML_LENGTH})
+}}, map {{"method": "json"}})
+"""
+
+
+def _copy_results(results: list[dict]) -> list[dict]:
+    """Copy register search results, so callers cannot alter cached entries."""
+    return [dict(entry) for entry in results]
+
 
 def register_register_tools(
     mcp: FastMCP,
@@ -66,43 +138,35 @@ def register_register_tools(
         if ctx:
             await ctx.info(f"Searching MoP {register_type} for: {query}")
 
-        client = await get_client()
+        cache_key = (query, register_type, max_results)
+        cached = _search_cache.get(cache_key)
+        if cached is not None:
+            return _copy_results(cached)
 
-        # Build XQuery with Lucene fulltext search
-        # This will be more efficient than contains() for large datasets
-        xquery = f"""
-        xquery version "3.1";
-        declare namespace tei="http://www.tei-c.org/ns/1.0";
-        declare namespace ft="http://exist-db.org/xquery/lucene";
-
-        let $collection := collection('{settings.ab_db_path}/Register/{register_type}')
-        let $hits := $collection//*[@xml:id][ft:query(., '{query}')]
-        let $results := array {{
-            for $hit in subsequence($hits, 1, {max_results})
-            let $score := ft:score($hit)
-            order by $score descending
-            return map {{
-                "id": $hit/@xml:id/string(),
-                "name": normalize-space(string-join($hit//text()[not(parent::tei:note)], ' ')),
-                "type": "{register_type}",
-                "gnd": $hit/@corresp/string()
-            }}
-        }}
-        return serialize($results, map {{"method": "json"}})
-        """
+        client = await get_client()
 
+        # Lucene fulltext search is more efficient than contains() for large datasets
         try:
-            result_json = await client.execute_xquery(xquery.strip(), how_many=1)
+            result_json = await client.execute_xquery_bytes(
+                SEARCH_XQUERY,
+                how_many=1,
+                variables={
+                    "query": query,
+                    "register-type": register_type,
+                    "max-results": max_results,
+                },
+            )
         except Exception as e:
             raise ToolError(f"Register-Suche fehlgeschlagen: {e}") from e
 
         # Parse JSON result
         try:
-            results = json.loads(result_json)
+            results = jsonlib.loads(result_json)
         except json.JSONDecodeError:
             # Fallback for older eXist versions or issues
-            results = []
+            return []
 
+        _search_cache.set(cache_key, _copy_results(results))
         return results
 
     @mcp.tool
@@ -135,49 +199,23 @@ def register_register_tools(
 
         client = await get_client()
 
-        query = f"""
-        xquery version "3.1";
-        declare namespace tei="http://www.tei-c.org/ns/1.0";
-
-        collection('{settings.ab_db_path}/Register/{register_type}')//*[@xml:id='{entry_id}']
-        """
-
         try:
-            xml_str = await client.execute_xquery(query.strip())
+            result_json = await client.execute_xquery_bytes(
+                ENTRY_XQUERY,
+                variables={"entry-id": entry_id, "register-type": register_type},
+            )
         except Exception as e:
             raise ToolError(f"Eintrag nicht gefunden: {e}") from e
 
-        if not xml_str.strip():
+        if not result_json.strip():
             raise ToolError(f"Eintrag '{entry_id}' nicht gefunden")
 
-        # Parse XML
-        try:
-            root = ET.fromstring(
-                f"<root xmlns:tei='http://www.tei-c.org/ns/1.0'>{xml_str}</root>"
-            )
-        except ET.ParseError as e:
-            raise ToolError(f"XML-Parse-Fehler: {e}") from e
-
-        # Extract content
-        text_content = ET.tostring(root, encoding="unicode", method="text").strip()
-
-        # Extract GND if available
-        gnd = root.find(".//*[@corresp]")
-        gnd_id = gnd.get("corresp") if gnd is not None else None
-
-        MAX_CONTENT_LENGTH = 1000
-        MAX_XML_LENGTH = 2000
+        entry = jsonlib.loads(result_json)
 
         return {
             "id": entry_id,
             "type": register_type,
-            "content": (
-                text_content[:MAX_CONTENT_LENGTH]
-                if len(text_content) > MAX_CONTENT_LENGTH
-                else text_content
-            ),
-            "gnd": gnd_id,
-            "xml": (
-                xml_str[:MAX_XML_LENGTH] if len(xml_str) > MAX_XML_LENGTH else xml_str
-            ),
+            "content": entry["content"],
+            "gnd": entry["gnd"],
+            "xml": entry["xml"],
         }
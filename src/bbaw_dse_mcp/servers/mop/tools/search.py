@@ -1,9 +1,8 @@
 """Search tools for MoP documents and fulltext search."""
 
-import logging
 from collections.abc import Callable, Coroutine
+import logging
 from typing import Any
-from xml.etree import ElementTree as ET
 
 from fastmcp import Context, FastMCP
 from fastmcp.exceptions import ToolError
@@ -11,11 +10,33 @@ from fastmcp.exceptions import ToolError
 from bbaw_dse_mcp.config.base import settings
 from bbaw_dse_mcp.schemas.base.documents import Document
 from bbaw_dse_mcp.schemas.base.responses import SearchResult
+from bbaw_dse_mcp.utils import jsonlib
 from bbaw_dse_mcp.utils.existdb import ExistDBClient
 
 # Namespace constants
 NS = {"tei": "http://www.tei-c.org/ns/1.0"}
 
+# Maximum length of document content returned by get_document
+MAX_CONTENT_LENGTH = 2000
+
+# The document ID is bound as an external variable rather than spliced into
+# the query text, so eXist can reuse the compiled query. Title and body text
+# are extracted and truncated server-side; the full TEI is only serialized
+# when it was requested.
+DOCUMENT_XQUERY = f"""
+xquery version "3.1";
+declare namespace tei="http://www.tei-c.org/ns/1.0";
+declare variable $document-id external;
+declare variable $include-xml external;
+
+for $doc in (collection('{settings.ab_db_path}')//tei:TEI[@xml:id = $document-id])[1]
+return serialize(map {{
+    "title": string(($doc//tei:titleStmt/tei:title)[1]),
+    "content": substring(string-join($doc//tei:body//text()), 1, {MAX_CONTENT_LENGTH}),
+    "xml": if ($include-xml) then serialize($doc) else ()
+}}, map {{ "method": "json" }})
+"""
+
 logger = logging.getLogger(__name__)
 
 # Type alias for client getter
@@ -127,7 +148,7 @@ def register_search_tools(
             SearchResult(
                 document_id=r["id"],
                 title=r["title"],
-                kwic_snippets=r.get("kwic_snippets"),
+                kwic_snippets=r.get("kwic_snippets") or None,
                 citation_url=f"{settings.ab_url}/dokument/{r['id']}",
                 type="document",
             )
@@ -168,56 +189,24 @@ def register_search_tools(
 
         client = await get_client()
 
-        query = f"""
-        xquery version "3.1";
-        declare namespace tei="http://www.tei-c.org/ns/1.0";
-
-        let $doc := collection('{settings.ab_db_path}')//tei:TEI[@xml:id='{document_id}']
-        return $doc
-        """
-
         try:
-            xml_str = await client.execute_xquery(query.strip())
+            result_json = await client.execute_xquery_bytes(
+                DOCUMENT_XQUERY,
+                variables={"document-id": document_id, "include-xml": include_xml},
+            )
         except Exception as e:
             raise ToolError(f"Dokument nicht gefunden: {e}") from e
 
-        if not xml_str.strip():
+        if not result_json.strip():
             raise ToolError(f"Dokument '{document_id}' nicht gefunden")
 
-        # Parse TEI-XML
-        try:
-            root = ET.fromstring(xml_str)
-        except ET.ParseError as e:
-            raise ToolError(f"XML-Parse-Fehler: {e}") from e
-
-        # Extract Metadaten
-        title_elem = root.find(".//tei:titleStmt/tei:title", NS)
-        title = (
-            title_elem.text
-            if title_elem is not None and title_elem.text
-            else "Unbekannt"
-        )
-
-        # Text extrahieren
-        body = root.find(".//tei:body", NS)
-        content = (
-            ET.tostring(body, encoding="unicode", method="text")
-            if body is not None
-            else ""
-        )
-
-        MAX_CONTENT_LENGTH = 2000
-        truncated_content = (
-            content[:MAX_CONTENT_LENGTH]
-            if len(content) > MAX_CONTENT_LENGTH
-            else content
-        )
+        document = jsonlib.loads(result_json)
 
         return Document(
             id=document_id,
             doc_type="document",
-            title=title,
-            content=truncated_content,
-            tei_xml=xml_str if include_xml else None,
+            title=document["title"] or "Unbekannt",
+            content=document["content"],
+            tei_xml=document["xml"],
             url=f"{settings.ab_url}/dokument/{document_id}",
         )
@@ -7,19 +7,26 @@ Data is available for years: 1800, 1845, 1872, 1891, 1914
 Source: https://actaborussica.bbaw.de/{year}.js (GeoJSON format)
 """
 
+import asyncio
 from collections.abc import Callable, Coroutine
+from contextlib import suppress
+from functools import partial
+from itertools import islice
 import logging
+from pathlib import Path
 from typing import Any
 
 from fastmcp import Context, FastMCP
 from fastmcp.exceptions import ToolError
 import httpx
+from pydantic import ValidationError
 
+from bbaw_dse_mcp.config.base import settings
 from bbaw_dse_mcp.schemas.mop.mop import (
     GeoJSONFeature,
     ResidentialTopography,
 )
-from bbaw_dse_mcp.utils.existdb import ExistDBClient
+from bbaw_dse_mcp.utils.existdb import HTTP2_AVAILABLE, ExistDBClient
 
 logger = logging.getLogger(__name__)
 
@@ -32,10 +39,72 @@ AVAILABLE_YEARS = [1800, 1845, 1872, 1891, 1914]
 # Base URL for Wohntopographie API
 WOHNTOPO_BASE_URL = "https://actaborussica.bbaw.de"
 
+# Seconds between background revalidations of the cached years
+WOHNTOPO_REFRESH_INTERVAL = 6 * 60 * 60.0
+
 # In-memory cache for fetched GeoJSON data
 # Key: year (int), Value: ResidentialTopography
 _wohntopo_cache: dict[int, ResidentialTopography] = {}
 
+# ETag of the cached data per year, sent as If-None-Match on revalidation
+_wohntopo_etags: dict[int, str] = {}
+
+# One lock per year, so concurrent cache misses for the same year fetch and
+# parse the dataset only once. Creating a lock involves no await, so the
+# dict itself needs no guard on the single-threaded event loop.
+_fetch_locks: dict[int, asyncio.Lock] = {}
+
+# Searches by their arguments: year, name, vorname, kategorie, taetigkeit,
+# stadt, strasse, ediarum_id, only_with_coordinates and max_results
+SearchKey = tuple[
+    int,
+    str | None,
+    str | None,
+    str | None,
+    str | None,
+    str | None,
+    str | None,
+    str | None,
+    bool,
+    int,
+]
+
+# Seconds a finished search result is shared with identical new searches
+SEARCH_COALESCE_WINDOW = 0.5
+
+# Running and recently finished searches, shared by identical requests
+_search_tasks: dict[SearchKey, asyncio.Task[dict[str, Any]]] = {}
+
+
+# Wohntopographie state container (avoids global keyword)
+class _WohntopoState:
+    """Container for the HTTP client and background task of the Wohntopographie tools."""
+
+    # Shared HTTP client, created on first use and closed on shutdown, so
+    # repeated fetches reuse the pooled keep-alive connections
+    http_client: httpx.AsyncClient | None = None
+    # Prewarms and then periodically revalidates all years. A reference is
+    # kept so the task is not garbage collected
+    background_task: asyncio.Task[None] | None = None
+
+
+_state = _WohntopoState()
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    """Return the shared HTTP client, creating it on first use."""
+    if _state.http_client is None:
+        _state.http_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(30.0, connect=5.0),
+            limits=httpx.Limits(
+                max_keepalive_connections=20,
+                max_connections=100,
+                keepalive_expiry=60.0,
+            ),
+            http2=HTTP2_AVAILABLE,
+        )
+    return _state.http_client
+
 
 async def _fetch_wohntopo_data(
     year: int,
@@ -59,30 +128,373 @@ async def _fetch_wohntopo_data(
             await ctx.info(f"Using cached data for year {year}")
         return _wohntopo_cache[year]
 
-    # Fetch from API
-    if ctx:
-        await ctx.info(f"Fetching residential topography for year {year} from API...")
+    lock = _fetch_locks.setdefault(year, asyncio.Lock())
+    async with lock:
+        # Another request may have filled the cache while we were waiting
+        if year in _wohntopo_cache:
+            return _wohntopo_cache[year]
+        return await _load_wohntopo_data(year, ctx)
+
+
+async def prewarm_wohntopo_data() -> None:
+    """Load all available years concurrently.
+
+    Total wall time is that of the slowest year instead of the sum of all.
+    Failures are logged and otherwise ignored; the affected years are fetched
+    again on their next request.
+    """
+    results = await asyncio.gather(
+        *(_fetch_wohntopo_data(year) for year in AVAILABLE_YEARS),
+        return_exceptions=True,
+    )
+    for year, result in zip(AVAILABLE_YEARS, results, strict=True):
+        if isinstance(result, BaseException):
+            logger.warning(f"Prewarming Wohntopographie year {year} failed: {result}")
+
+
+async def _refresh_wohntopo_data(year: int) -> None:
+    """Revalidate a cached year against the API with a conditional GET.
+
+    The stored ETag is sent as If-None-Match, so an unchanged dataset costs
+    a 304 response without body or parsing. Changed data replaces the cache
+    entry.
+
+    Raises:
+        httpx.HTTPError: If the request fails
+    """
+    headers = {}
+    etag = _wohntopo_etags.get(year)
+    if etag:
+        headers["If-None-Match"] = etag
+
+    response = await _get_http_client().get(
+        f"{WOHNTOPO_BASE_URL}/{year}.js", headers=headers
+    )
+    if response.status_code == httpx.codes.NOT_MODIFIED:
+        return
+    response.raise_for_status()
+
+    _wohntopo_cache[year] = await asyncio.to_thread(_parse_wohntopo_data, response.content)
+    await _store_response(year, response)
+    logger.info(f"Refreshed Wohntopographie data for year {year}")
+
+
+async def _maintain_wohntopo_data() -> None:
+    """Prewarm all years, then revalidate the cached ones periodically."""
+    await prewarm_wohntopo_data()
+    while True:
+        await asyncio.sleep(WOHNTOPO_REFRESH_INTERVAL)
+        years = list(_wohntopo_cache)
+        results = await asyncio.gather(
+            *(_refresh_wohntopo_data(year) for year in years),
+            return_exceptions=True,
+        )
+        for year, result in zip(years, results, strict=True):
+            if isinstance(result, BaseException):
+                logger.warning(f"Refreshing Wohntopographie year {year} failed: {result}")
+
+
+def start_wohntopo_maintenance() -> None:
+    """Start prewarming and revalidation in the background, once per process.
+
+    Called from the server lifespan on startup. Requests for a year that is
+    still loading join the in-flight fetch through the per-year lock instead
+    of loading it twice.
+    """
+    if _state.background_task is None:
+        _state.background_task = asyncio.create_task(_maintain_wohntopo_data())
+
+
+async def stop_wohntopo_maintenance() -> None:
+    """Cancel the background prewarming and revalidation and close the HTTP client.
+
+    Called from the server lifespan on shutdown.
+    """
+    task, _state.background_task = _state.background_task, None
+    if task is not None:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+
+    client, _state.http_client = _state.http_client, None
+    if client is not None:
+        await client.aclose()
+
+
+def _disk_cache_file(year: int, suffix: str) -> Path | None:
+    """Return the path of a disk cache file for a year, if disk caching is on."""
+    cache_dir = settings.ab_wohntopo_cache_dir
+    if cache_dir is None:
+        return None
+    return cache_dir / f"wohntopo_{year}{suffix}"
+
+
+def _read_disk_cache(year: int) -> tuple[bytes, str | None] | None:
+    """Read the cached GeoJSON of a year and its ETag from disk, if present."""
+    path = _disk_cache_file(year, ".json")
+    etag_path = _disk_cache_file(year, ".etag")
+    if path is None or etag_path is None:
+        return None
+    try:
+        content = path.read_bytes()
+    except OSError:
+        return None
+    try:
+        etag = etag_path.read_text(encoding="utf-8")
+    except OSError:
+        etag = None
+    return content, etag
+
 
+def _write_disk_cache(year: int, content: bytes, etag: str | None) -> None:
+    """Write the GeoJSON of a year (and its ETag, if any) to the disk cache.
+
+    Files are written to a temporary name first and then renamed, so readers
+    never see a partially written file. Failures are logged and ignored.
+    """
+    path = _disk_cache_file(year, ".json")
+    etag_path = _disk_cache_file(year, ".etag")
+    if path is None or etag_path is None:
+        return
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_bytes(content)
+        tmp_path.replace(path)
+        if etag:
+            etag_path.write_text(etag, encoding="utf-8")
+        else:
+            etag_path.unlink(missing_ok=True)
+    except OSError as e:
+        logger.warning(f"Could not write Wohntopographie disk cache for {year}: {e}")
+
+
+async def _store_response(year: int, response: httpx.Response) -> None:
+    """Remember the ETag of a fetched year and write it to the disk cache."""
+    etag = response.headers.get("ETag")
+    if etag:
+        _wohntopo_etags[year] = etag
+    else:
+        _wohntopo_etags.pop(year, None)
+    await asyncio.to_thread(_write_disk_cache, year, response.content, etag)
+
+
+def _parse_wohntopo_data(content: bytes) -> ResidentialTopography:
+    """Parse and index a Wohntopographie GeoJSON document.
+
+    The bytes are parsed and validated in one step by pydantic-core's JSON
+    parser, skipping the intermediate dicts, and indexed for substring search.
+    This is CPU-bound, so callers run it in a worker thread to keep the
+    event loop responsive.
+    """
+    topo = ResidentialTopography.model_validate_json(content)
+    topo.build_search_index()
+    return topo
+
+
+async def _load_wohntopo_data(
+    year: int,
+    ctx: Context | None = None,
+) -> ResidentialTopography:
+    """Load Wohntopographie data from the disk cache or the API and cache it.
+
+    The datasets are static historical data, so a copy on disk is used
+    without contacting the API; the background revalidation picks up
+    changes later.
+
+    Args:
+        year: Year to fetch
+        ctx: FastMCP Context for progress reporting
+
+    Returns:
+        ResidentialTopography object with all features
+
+    Raises:
+        ToolError: If the API request fails
+    """
+    topo = None
+    cached = await asyncio.to_thread(_read_disk_cache, year)
+    if cached is not None:
+        content, etag = cached
+        try:
+            topo = await asyncio.to_thread(_parse_wohntopo_data, content)
+            if etag:
+                _wohntopo_etags[year] = etag
+        except ValidationError as e:
+            logger.warning(f"Ignoring invalid Wohntopographie disk cache for {year}: {e}")
+
+    if topo is None:
+        # Fetch from API
+        if ctx:
+            await ctx.info(
+                f"Fetching residential topography for year {year} from API..."
+            )
+
+        try:
             url = f"{WOHNTOPO_BASE_URL}/{year}.js"
-            response = await client.get(url)
+            response = await _get_http_client().get(url)
             response.raise_for_status()
+        except httpx.HTTPError as e:
+            raise ToolError(f"Failed to fetch Wohntopographie data: {e}") from e
+
+        topo = await asyncio.to_thread(_parse_wohntopo_data, response.content)
+        await _store_response(year, response)
 
-            # Parse GeoJSON
-            geojson_data = response.json()
-            topo = ResidentialTopography(**geojson_data)
+    # Store in cache
+    _wohntopo_cache[year] = topo
 
-            # Store in cache
-            _wohntopo_cache[year] = topo
+    if ctx:
+        await ctx.info(f"Cached {len(topo.features)} entries for year {year}")
+
+    return topo
+
+
+def _contains(values: list[str], pattern: str, i: int) -> bool:
+    """Return whether the value at position i contains pattern."""
+    return pattern in values[i]
+
+
+async def _search_topography(key: SearchKey) -> dict[str, Any]:
+    """Run a residential topography search, see search_residential_topography().
+
+    The search runs without a request context, since its result may be
+    shared by several requests (see _coalesced_search()).
+    """
+    (
+        year,
+        name,
+        vorname,
+        kategorie,
+        taetigkeit,
+        stadt,
+        strasse,
+        ediarum_id,
+        only_with_coordinates,
+        max_results,
+    ) = key
+
+    # Fetch data (with caching)
+    topo = await _fetch_wohntopo_data(year)
+
+    features = topo.features
+    filters_applied = [
+        f"{label}{value}'"
+        for label, value in (
+            ("ediarum_id='", ediarum_id),
+            ("name contains '", name),
+            ("vorname contains '", vorname),
+            ("kategorie contains '", kategorie),
+            ("taetigkeit contains '", taetigkeit),
+            ("stadt contains '", stadt),
+            ("strasse contains '", strasse),
+        )
+        if value
+    ]
+    if only_with_coordinates:
+        filters_applied.append("only entries with coordinates")
+
+    # Case-insensitive substring filters as (field, case-folded pattern)
+    substring_filters: list[tuple[str, str]] = []
+    for field, value in (
+        ("name", name),
+        ("vorname", vorname),
+        ("taetigkeit", taetigkeit),
+        ("stadt", stadt),
+        ("strasse", strasse),
+    ):
+        if value:
+            substring_filters.append((field, value.casefold()))
+
+    kategorie_cf = kategorie.casefold() if kategorie else None
+
+    # An Ediarum-ID pins down the candidates via a dict lookup. Otherwise
+    # narrow them down via the trigram index where patterns are long
+    # enough. All remaining candidates are verified below
+    candidates: set[int] | None = None
+    if ediarum_id:
+        candidates = set(topo.ediarum_id_positions(ediarum_id))
+    else:
+        for field, pattern in substring_filters:
+            found = topo.substring_candidates(field, pattern)
+            if found is not None:
+                candidates = found if candidates is None else candidates & found
+        if kategorie_cf:
+            found_1 = topo.substring_candidates("kategorie1", kategorie_cf)
+            found_2 = topo.substring_candidates("kategorie2", kategorie_cf)
+            if found_1 is not None and found_2 is not None:
+                found = found_1 | found_2
+                candidates = found if candidates is None else candidates & found
+
+    # Build one predicate per active filter over feature positions
+    predicates: list[Callable[[int], bool]] = []
+
+    # The common full-name search checks last and first name in one call
+    if name and vorname:
+        name_cf, vorname_cf = name.casefold(), vorname.casefold()
+        names = topo.folded_values("name")
+        vornames = topo.folded_values("vorname")
+        predicates.append(lambda i: name_cf in names[i] and vorname_cf in vornames[i])
+        name_fields = {"name", "vorname"}
+    else:
+        name_fields = set()
+
+    for field, pattern in substring_filters:
+        if field in name_fields:
+            continue
+        predicates.append(partial(_contains, topo.folded_values(field), pattern))
+
+    if kategorie_cf:
+        kategorie1 = topo.folded_values("kategorie1")
+        kategorie2 = topo.folded_values("kategorie2")
+        predicates.append(
+            lambda i: kategorie_cf in kategorie1[i] or kategorie_cf in kategorie2[i]
+        )
+
+    if only_with_coordinates:
+        predicates.append(lambda i: features[i].has_coordinates())
+
+    # Single pass over the candidates, stopping at the first failing filter.
+    # Only the returned page is materialized; the rest is merely counted
+    positions = sorted(candidates) if candidates is not None else range(len(features))
+    matches = (features[i] for i in positions if all(p(i) for p in predicates))
+    results = list(islice(matches, max_results))
+    total_matches = len(results) + sum(1 for _ in matches)
+
+    return {
+        "year": year,
+        "filters_applied": filters_applied,
+        "total_matches": total_matches,
+        "returned_results": len(results),
+        "results": [_feature_to_dict(f) for f in results],
+    }
 
-            if ctx:
-                await ctx.info(f"Cached {len(topo.features)} entries for year {year}")
 
-            return topo
+async def _coalesced_search(key: SearchKey) -> dict[str, Any]:
+    """Run a search, sharing the result with identical concurrent searches.
 
-    except httpx.HTTPError as e:
-        raise ToolError(f"Failed to fetch Wohntopographie data: {e}") from e
+    Identical searches started while one is running, or within
+    SEARCH_COALESCE_WINDOW seconds after it finished, await the same task
+    instead of scanning the dataset again. Failed searches are not shared
+    after they finish. The shared task runs without a request context, so
+    each caller reports progress to its own client.
+    """
+    task = _search_tasks.get(key)
+    if task is None:
+        task = asyncio.create_task(_search_topography(key))
+        _search_tasks[key] = task
+        task.add_done_callback(lambda t: _expire_search(key, t))
+    # Shield the shared task, so a cancelled caller does not cancel it for others
+    return await asyncio.shield(task)
+
+
+def _expire_search(key: SearchKey, task: asyncio.Task[dict[str, Any]]) -> None:
+    """Drop a finished search from the shared tasks, after the window if it succeeded."""
+    if task.cancelled() or task.exception() is not None:
+        _search_tasks.pop(key, None)
+    else:
+        asyncio.get_running_loop().call_later(
+            SEARCH_COALESCE_WINDOW, _search_tasks.pop, key, None
+        )
 
 
 def register_wohntopo_tools(
@@ -157,6 +569,7 @@ def register_wohntopo_tools(
                 "search_by_occupation": "Filter by occupation/activity",
                 "search_by_location": "Filter by city or street",
                 "search_by_ediarum_id": "Find exact person by Ediarum-ID",
+                "search_by_bbox": "Find entries inside a geographic bounding box",
             },
         }
 
@@ -225,57 +638,97 @@ def register_wohntopo_tools(
                 "(name, vorname, kategorie, taetigkeit, stadt, strasse, or ediarum_id)"
             )
 
-        # Fetch data (with caching)
-        topo = await _fetch_wohntopo_data(year, ctx)
+        if ctx:
+            if year in _wohntopo_cache:
+                await ctx.info(f"Using cached data for year {year}")
+            else:
+                await ctx.info(f"Loading residential topography for year {year}...")
+
+        result = await _coalesced_search(
+            (
+                year,
+                name,
+                vorname,
+                kategorie,
+                taetigkeit,
+                stadt,
+                strasse,
+                ediarum_id,
+                only_with_coordinates,
+                max_results,
+            )
+        )
 
-        # Apply filters
-        results: list[GeoJSONFeature] = topo.features
-        filters_applied: list[str] = []
+        if ctx:
+            await ctx.info(f"Found {result['total_matches']} matching entries")
 
-        if ediarum_id:
-            results = topo.get_by_ediarum_id(ediarum_id)
-            filters_applied.append(f"ediarum_id='{ediarum_id}'")
+        return result
 
-        if name or vorname:
-            results = topo.get_by_name(name=name, vorname=vorname)
-            if name:
-                filters_applied.append(f"name contains '{name}'")
-            if vorname:
-                filters_applied.append(f"vorname contains '{vorname}'")
+    @mcp.tool
+    async def search_residential_by_bbox(
+        year: int,
+        min_lon: float,
+        min_lat: float,
+        max_lon: float,
+        max_lat: float,
+        *,
+        max_results: int = 50,
+        ctx: Context | None = None,
+    ) -> dict[str, Any]:
+        """Find residential topography entries inside a geographic bounding box.
 
-        if kategorie:
-            results = [f for f in results if f in topo.get_by_category(kategorie)]
-            filters_applied.append(f"kategorie contains '{kategorie}'")
+        PURPOSE: Spatial search for persons/institutions living in a given area.
 
-        if taetigkeit:
-            results = [f for f in results if f in topo.get_by_occupation(taetigkeit)]
-            filters_applied.append(f"taetigkeit contains '{taetigkeit}'")
+        WHEN TO USE:
+        - User asks who lived in a certain district or around a place
+        - User wants entries near given coordinates
+        - For mapping a section of a city
 
-        if stadt:
-            results = [f for f in results if f in topo.get_by_city(stadt)]
-            filters_applied.append(f"stadt contains '{stadt}'")
+        WHEN NOT TO USE:
+        - For searches by name, category or street → use search_residential_topography()
 
-        if strasse:
-            results = [f for f in results if f in topo.get_by_street(strasse)]
-            filters_applied.append(f"strasse contains '{strasse}'")
+        Args:
+            year: Year for data (1800, 1845, 1872, 1891, or 1914)
+            min_lon: Western boundary (longitude, WGS84)
+            min_lat: Southern boundary (latitude, WGS84)
+            max_lon: Eastern boundary (longitude, WGS84)
+            max_lat: Northern boundary (latitude, WGS84)
+            max_results: Maximum number of results to return
+            ctx: FastMCP Context
 
-        if only_with_coordinates:
-            results = [f for f in results if f.has_coordinates()]
-            filters_applied.append("only entries with coordinates")
+        Returns:
+            Dict with:
+            - year: The queried year
+            - bbox: The queried bounding box
+            - total_matches: Number of entries inside the box
+            - returned_results: Number of results in response (limited by max_results)
+            - results: List of matching features
 
-        if ctx:
-            await ctx.info(f"Found {len(results)} matching entries")
+        Raises:
+            ToolError: If year is not available or the bounding box is invalid
+        """
+        if year not in AVAILABLE_YEARS:
+            raise ToolError(
+                f"Year {year} not available. Available years: {', '.join(map(str, AVAILABLE_YEARS))}"
+            )
+        if min_lon > max_lon or min_lat > max_lat:
+            raise ToolError("Invalid bounding box: minimum exceeds maximum")
 
-        # Limit results
-        total_matches = len(results)
-        results = results[:max_results]
+        # Fetch data (with caching)
+        topo = await _fetch_wohntopo_data(year, ctx)
+
+        positions = topo.bbox_positions(min_lon, min_lat, max_lon, max_lat)
+
+        if ctx:
+            await ctx.info(f"Found {len(positions)} entries inside the bounding box")
 
+        features = topo.features
         return {
             "year": year,
-            "filters_applied": filters_applied,
-            "total_matches": total_matches,
-            "returned_results": len(results),
-            "results": [_feature_to_dict(f) for f in results],
+            "bbox": [min_lon, min_lat, max_lon, max_lat],
+            "total_matches": len(positions),
+            "returned_results": min(len(positions), max_results),
+            "results": [_feature_to_dict(features[i]) for i in positions[:max_results]],
         }
 
     @mcp.tool
@@ -321,23 +774,20 @@ def _feature_to_dict(feature: GeoJSONFeature) -> dict[str, Any]:
         Dict with essential information
     """
     props = feature.properties
+    vorname, name = props.vorname, props.name
+    adelstitel, adelspraedikat = props.adelstitel, props.adelspraedikat
     result: dict[str, Any] = {
         "tabellen_id": props.tabellen_id,
         "ediarum_id": props.ediarum_id,
     }
 
     # Name information
-    if props.adelspraedikat or props.adelstitel:
-        full_name_parts = [
-            props.adelstitel,
-            props.vorname,
-            props.adelspraedikat,
-            props.name,
-        ]
-        result["full_name"] = " ".join(p for p in full_name_parts if p)
+    full_name_parts: tuple[str | None, ...]
+    if adelspraedikat or adelstitel:
+        full_name_parts = (adelstitel, vorname, adelspraedikat, name)
     else:
-        name_parts = [props.vorname, props.name]
-        result["full_name"] = " ".join(p for p in name_parts if p)
+        full_name_parts = (vorname, name)
+    result["full_name"] = " ".join(filter(None, full_name_parts))
 
     # Categories and occupation
     if props.kategorie1:
@@ -348,25 +798,20 @@ def _feature_to_dict(feature: GeoJSONFeature) -> dict[str, Any]:
         result["rang"] = props.rang
 
     # Address
-    address_parts = []
-    if props.strasse:
-        street = props.strasse
-        if props.hausnummer:
-            street = f"{street} {props.hausnummer}"
-        address_parts.append(street)
-    if props.adresszusatz:
-        address_parts.append(props.adresszusatz)
-    if props.stadt:
-        address_parts.append(props.stadt)
-
-    if address_parts:
-        result["address"] = ", ".join(address_parts)
+    street = props.strasse
+    if street and props.hausnummer:
+        street = f"{street} {props.hausnummer}"
+    address = ", ".join(filter(None, (street, props.adresszusatz, props.stadt)))
+    if address:
+        result["address"] = address
 
     # Coordinates
-    if feature.has_coordinates():
+    coordinates = feature.coordinates_pair()
+    if coordinates is not None:
+        longitude, latitude = coordinates
         result["coordinates"] = {
-            "longitude": feature.get_longitude(),
-            "latitude": feature.get_latitude(),
+            "longitude": longitude,
+            "latitude": latitude,
         }
 
     # Additional info
@@ -5,8 +5,9 @@ This module provides resources specific to the Schleiermacher edition,
 including letters, diaries, and lectures.
 """
 
+import asyncio
 from collections.abc import Awaitable
-from pathlib import Path
+from importlib.resources import files
 from typing import Protocol
 
 from fastmcp import FastMCP
@@ -21,8 +22,62 @@ from bbaw_dse_mcp.servers.schleiermacher.utils.letters import (
     format_letter_as_markdown,
     parse_letter,
 )
+from bbaw_dse_mcp.utils.cache import TTLCache
 from bbaw_dse_mcp.utils.existdb import DocumentNotFoundError, ExistDBClient
-from bbaw_dse_mcp.utils.tei import determine_doctype
+from bbaw_dse_mcp.utils.tei import determine_doctype_cached
+
+# Bundled resource files, resolved through the import system so they are
+# also found when the package is installed as a zip archive
+RESOURCES = files("bbaw_dse_mcp.servers.schleiermacher.resources")
+
+
+def _load_markdown(filename: str, title: str, what: str) -> str:
+    """Read a bundled markdown file, returning a short notice if it is unreadable.
+
+    Args:
+        filename: Name of the file next to this module
+        title: Heading used for the fallback notice
+        what: Description of the file content used in the fallback notice
+
+    Returns:
+        File content or a markdown notice describing the problem
+    """
+    try:
+        return RESOURCES.joinpath(filename).read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return f"# {title}\n\n{what.capitalize()} file not found."
+    except (OSError, UnicodeDecodeError) as e:
+        return f"# {title}\n\nError loading {what}: {e}"
+
+
+# Static resources, read once at import instead of on every resource request
+_PROJECT_INFO_TEXT = _load_markdown(
+    "project_info.md", "Schleiermacher Digital", "project information"
+)
+_CITATION_POLICY_TEXT = _load_markdown("citation_policy.md", "Citation Policy", "policy")
+
+
+# LRU cache of rendered document markdown, keyed by document ID, shared by
+# the document resource and the get_document_by_id tool. Edited documents
+# are picked up once their entry expires.
+DOCUMENT_CACHE_SIZE = 256
+DOCUMENT_CACHE_TTL = 3600.0
+document_cache: TTLCache[str, str] = TTLCache(DOCUMENT_CACHE_SIZE, DOCUMENT_CACHE_TTL)
+
+
+def _render_document(xml_str: str, doc_id: str, doctype: str) -> str:
+    """Parse a TEI document and format it as markdown.
+
+    Letters ("letter fs") use the comprehensive letter parser, all other
+    document types (lecture, diary, etc.) the generic parser.
+
+    Raises:
+        etree.XMLSyntaxError, AttributeError, KeyError, ValueError: If the
+            document cannot be parsed
+    """
+    if doctype == "letter fs":
+        return format_letter_as_markdown(parse_letter(xml_str, doc_id))
+    return format_generic_document_as_markdown(parse_generic_document(xml_str, doc_id))
 
 
 class ClientGetter(Protocol):
@@ -48,13 +103,7 @@ def register_schleiermacher_resources(
         Provides context about the project, data structure, and available content.
         Loads information from project_info.md file.
         """
-        project_info_path = Path(__file__).parent / "project_info.md"
-        try:
-            return project_info_path.read_text(encoding="utf-8")
-        except FileNotFoundError:
-            return "# Schleiermacher Digital\n\nProject information file not found."
-        except (OSError, UnicodeDecodeError) as e:
-            return f"# Schleiermacher Digital\n\nError loading project information: {e}"
+        return _PROJECT_INFO_TEXT
 
     @mcp.resource("schleiermacher://citation-policy")
     def get_citation_policy() -> str:
@@ -63,13 +112,7 @@ def register_schleiermacher_resources(
         READ THIS FIRST before citing any documents from the Schleiermacher edition.
         Explains how to properly cite documents and avoid inventing document IDs.
         """
-        policy_path = Path(__file__).parent / "citation_policy.md"
-        try:
-            return policy_path.read_text(encoding="utf-8")
-        except FileNotFoundError:
-            return "# Citation Policy\n\nPolicy file not found."
-        except (OSError, UnicodeDecodeError) as e:
-            return f"# Citation Policy\n\nError loading policy: {e}"
+        return _CITATION_POLICY_TEXT
 
     @mcp.resource("schleiermacher://document/{doc_id}")
     async def get_document_resource(doc_id: str) -> str:
@@ -82,6 +125,10 @@ def register_schleiermacher_resources(
         Args:
             doc_id: Document ID (xml:id attribute)
         """
+        cached = document_cache.get(doc_id)
+        if cached is not None:
+            return cached
+
         client = await get_client()
 
         try:
@@ -93,24 +140,14 @@ def register_schleiermacher_resources(
             return f"Document '{doc_id}' not found."
 
         # Determine document type for processing
+        doctype = determine_doctype_cached(doc_id, xml_str)
+        if not doctype:
+            return f"Document '{doc_id}' has no recognized type"
 
-        doctype = determine_doctype(xml_str)
-
-        if doctype == "letter fs":
-            # Parse using comprehensive letter parser
-            try:
-                letter = parse_letter(xml_str, doc_id)
-                return format_letter_as_markdown(letter)
-            except (etree.XMLSyntaxError, AttributeError, KeyError, ValueError) as e:
-                return f"Error processing '{doc_id}': {e}"
-
-        # Handle other document types (lecture, diary, etc.) with generic parser
-        if doctype:
-            try:
-                doc = parse_generic_document(xml_str, doc_id)
-                return format_generic_document_as_markdown(doc)
-            except (etree.XMLSyntaxError, AttributeError, KeyError, ValueError) as e:
-                return f"Error processing '{doc_id}': {e}"
-
-        # Fallback if no doctype found
-        return f"Document '{doc_id}' has no recognized type"
+        # Parse in a worker thread so large documents do not block the event loop
+        try:
+            markdown = await asyncio.to_thread(_render_document, xml_str, doc_id, doctype)
+        except (etree.XMLSyntaxError, AttributeError, KeyError, ValueError) as e:
+            return f"Error processing '{doc_id}': {e}"
+        document_cache.set(doc_id, markdown)
+        return markdown
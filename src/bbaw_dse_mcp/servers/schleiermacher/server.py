@@ -16,6 +16,7 @@ from bbaw_dse_mcp.servers.schleiermacher.tools.search import register_search_too
 from bbaw_dse_mcp.servers.schleiermacher.utils.existdb import (
     get_client,
     get_letter_cache,
+    get_letter_register_index,
 )
 from bbaw_dse_mcp.tools.existdb import register_existdb_tools
 
@@ -33,7 +34,7 @@ register_schleiermacher_resources(mcp, get_client)
 
 # Register Schleiermacher-specific tools from submodules
 register_docs_tools(mcp, get_client)
-register_register_tools(mcp, get_client)
+register_register_tools(mcp, get_client, get_letter_register_index)
 register_search_tools(mcp, get_client, get_letter_cache)
 register_diary_tools(mcp, get_client)
 register_chronology_tools(mcp, get_client)
@@ -5,82 +5,122 @@ This module provides tools for accessing chronological entries
 from Schleiermacher's life by specific date, date range, or year.
 """
 
+import asyncio
 from collections.abc import Awaitable
+import copy
 from datetime import datetime
-import re
-from typing import Protocol, cast
+import json
+from typing import Protocol
 
 from fastmcp import Context, FastMCP
 from fastmcp.exceptions import ToolError
-from lxml import etree
 
-from bbaw_dse_mcp.config.base import TEI_NS, settings
+from bbaw_dse_mcp.config.base import settings
+from bbaw_dse_mcp.utils import jsonlib
 from bbaw_dse_mcp.utils.existdb import ExistDBClient
 
+CHRONOLOGY_PATH = f"{settings.sd_data_path}/Chronologie"
+
+# Projects a chronology item to the returned fields, or to nothing if it has
+# no date. The event text is everything in the item outside its first date,
+# so neither the item subtree nor the date prefix handling reaches Python.
+CHRONOLOGY_ENTRY_FUNCTION = """
+declare function local:entry($item as element()) as map(*)? {
+    let $date := ($item//tei:date)[1]
+    return
+        if (empty($date)) then ()
+        else map {
+            "date_display": normalize-space($date),
+            "when": $date/@when/string(),
+            "notBefore": $date/@notBefore/string(),
+            "notAfter": $date/@notAfter/string(),
+            "cert": $date/@cert/string(),
+            "event": normalize-space(string-join(
+                $item//text()[not(ancestor::tei:date[. is $date])], ''))
+        }
+};
+"""
 
-class ClientGetter(Protocol):
-    """Protocol for async client getter function."""
+# Chronology items on a date, including date ranges containing it
+CHRONOLOGY_DATE_XQUERY = f"""
+xquery version "3.1";
+declare namespace tei="http://www.tei-c.org/ns/1.0";
+declare variable $date external;
+{CHRONOLOGY_ENTRY_FUNCTION}
+let $entries := array {{
+    for $item in collection('{CHRONOLOGY_PATH}')//tei:item
+    let $dates := $item//tei:date
+    where $dates/@when = $date
+       or ($dates/@notBefore <= $date and $dates/@notAfter >= $date)
+    return local:entry($item)
+}}
+return serialize($entries, map {{"method": "json"}})
+"""
 
-    def __call__(self) -> Awaitable[ExistDBClient]: ...
+# Chronology items in a date range, projected to the returned fields
+CHRONOLOGY_RANGE_XQUERY = f"""
+xquery version "3.1";
+declare namespace tei="http://www.tei-c.org/ns/1.0";
+declare variable $date-from external;
+declare variable $date-to external;
+{CHRONOLOGY_ENTRY_FUNCTION}
+let $entries := array {{
+    (: Include items where @when is within the range or the date range
+       (@notBefore/@notAfter) overlaps with the query range :)
+    for $item in collection('{CHRONOLOGY_PATH}')//tei:item
+    let $date := $item//tei:date
+    let $when := $date/@when
+    let $notBefore := $date/@notBefore
+    let $notAfter := $date/@notAfter
+    where ($when >= $date-from and $when <= $date-to)
+       or ($notBefore and $notAfter and
+           not($notAfter < $date-from or $notBefore > $date-to))
+    order by
+        if ($when) then $when
+        else if ($notBefore) then $notBefore
+        else '0000-00-00'
+    return local:entry($item)
+}}
+return serialize($entries, map {{"method": "json"}})
+"""
 
+# Heading and items of the chronology document of one year. Each year has
+# its own XML file: 1768.xml, 1772.xml, etc. Returns nothing if it is missing.
+CHRONOLOGY_YEAR_XQUERY = f"""
+xquery version "3.1";
+declare namespace tei="http://www.tei-c.org/ns/1.0";
+declare variable $year external;
+{CHRONOLOGY_ENTRY_FUNCTION}
+let $path := '{CHRONOLOGY_PATH}/Chronologie/' || $year || '.xml'
+return
+    if (doc-available($path)) then
+        let $doc := doc($path)
+        return serialize(map {{
+            "heading": ($doc//tei:div/tei:head/text())[1]/string(),
+            "entries": array {{
+                for $item in $doc//tei:item
+                return local:entry($item)
+            }}
+        }}, map {{"method": "json"}})
+    else
+        ()
+"""
 
-def _extract_text(elem: etree._Element) -> str:
-    """Extract all text content from an XML element.
+# Parsed chronology years. They are static edition data covering only
+# Schleiermacher's lifetime, so entries are kept for the whole process.
+_year_cache: dict[int, dict] = {}
 
-    Args:
-        elem: XML element
+# One lock per year, so concurrent misses fetch each year only once
+_year_locks: dict[int, asyncio.Lock] = {}
 
-    Returns:
-        Concatenated text content with normalized whitespace
-    """
-    raw_text = "".join(cast("str", t) for t in elem.itertext())
-    # Normalize all whitespace (newlines, tabs, multiple spaces) to single space
-    return re.sub(r"\s+", " ", raw_text).strip()
 
+class ClientGetter(Protocol):
+    """Protocol for async client getter function."""
 
-def _parse_chronology_item(item: etree._Element) -> dict:
-    """Parse a single chronology item element.
+    def __call__(self) -> Awaitable[ExistDBClient]: ...
 
-    Args:
-        item: XML item element
 
-    Returns:
-        Dictionary with date info and event text
-    """
-    # Find the date element
-    date_elem = item.find(".//tei:date", TEI_NS)
-    if date_elem is None:
-        return {}
-
-    # Extract date attributes
-    date_attrs = {
-        "when": date_elem.get("when"),
-        "notBefore": date_elem.get("notBefore"),
-        "notAfter": date_elem.get("notAfter"),
-        "cert": date_elem.get("cert"),
-        "calendar": date_elem.get("calendar"),
-    }
-
-    # Get the date text (display text like "August 29" or "Im Jahr")
-    date_text = _extract_text(date_elem)
-
-    # Get the event text (everything in the item except the date element)
-    full_text = _extract_text(item)
-    event_text = full_text
-    if date_text and full_text.startswith(date_text):
-        event_text = full_text[len(date_text) :].strip()
-
-    return {
-        "date_display": date_text,
-        "when": date_attrs["when"],
-        "notBefore": date_attrs["notBefore"],
-        "notAfter": date_attrs["notAfter"],
-        "cert": date_attrs["cert"],
-        "event": event_text,
-    }
-
-
-def register_chronology_tools(  # noqa: C901
+def register_chronology_tools(
     mcp: FastMCP,
     get_client: ClientGetter,
 ) -> None:
@@ -91,6 +131,38 @@ def register_chronology_tools(  # noqa: C901
         get_client: Async function that returns an ExistDBClient
     """
 
+    async def _fetch_chronology_year(year: int) -> dict:
+        """Fetch the heading and entries of one chronology year.
+
+        Raises:
+            ToolError: If the query fails or no chronology exists for the year
+        """
+        client = await get_client()
+
+        try:
+            result_json = await client.execute_xquery_bytes(
+                CHRONOLOGY_YEAR_XQUERY, how_many=1, variables={"year": year}
+            )
+        except Exception as e:
+            raise ToolError(f"Error retrieving chronology for year {year}: {e}") from e
+
+        if not result_json or result_json.isspace():
+            raise ToolError(
+                f"No chronology found for year {year}. "
+                f"Chronology covers Schleiermacher's lifetime (1768-1834)."
+            )
+
+        try:
+            chronology = jsonlib.loads(result_json)
+        except json.JSONDecodeError as e:
+            raise ToolError(f"Error parsing chronology result: {e}") from e
+
+        return {
+            "year": year,
+            "heading": chronology["heading"] or f"Chronology {year}",
+            "entries": chronology["entries"],
+        }
+
     @mcp.tool
     async def get_chronology_entry(
         date: str,
@@ -134,41 +206,17 @@ def register_chronology_tools(  # noqa: C901
 
         client = await get_client()
 
-        # XQuery to find chronology items with matching date
-        xquery = f"""
-        declare namespace tei = "http://www.tei-c.org/ns/1.0";
-
-        for $item in collection('{settings.sd_data_path}/Chronologie')//tei:item
-        let $date := $item//tei:date
-        let $when := $date/@when
-        let $notBefore := $date/@notBefore
-        let $notAfter := $date/@notAfter
-        where $when = '{date}'
-           or ($notBefore <= '{date}' and $notAfter >= '{date}')
-        return $item
-        """
-
         try:
-            result = await client.execute_xquery(xquery)
+            result_json = await client.execute_xquery_bytes(
+                CHRONOLOGY_DATE_XQUERY, how_many=1, variables={"date": date}
+            )
         except Exception as e:
             raise ToolError(f"Error retrieving chronology for {date}: {e}") from e
 
-        if not result or result.strip() == "":
-            return []
-
-        # Wrap results in root element for parsing
-        wrapped_result = f"<results>{result}</results>"
-
         try:
-            root = etree.fromstring(wrapped_result.encode("utf-8"))
-        except etree.XMLSyntaxError as e:
-            raise ToolError(f"Error parsing chronology XML: {e}") from e
-
-        entries = []
-        for item in root.findall(".//tei:item", TEI_NS):
-            parsed = _parse_chronology_item(item)
-            if parsed:
-                entries.append(parsed)
+            entries = jsonlib.loads(result_json)
+        except json.JSONDecodeError as e:
+            raise ToolError(f"Error parsing chronology result: {e}") from e
 
         if ctx and entries:
             await ctx.info(f"Found {len(entries)} chronology entries for {date}")
@@ -225,51 +273,21 @@ def register_chronology_tools(  # noqa: C901
 
         client = await get_client()
 
-        # XQuery to find chronology items in the date range
-        # Include items where:
-        # - @when is within range
-        # - date range (@notBefore/@notAfter) overlaps with query range
-        xquery = f"""
-        declare namespace tei = "http://www.tei-c.org/ns/1.0";
-
-        for $item in collection('{settings.sd_data_path}/Chronologie')//tei:item
-        let $date := $item//tei:date
-        let $when := $date/@when
-        let $notBefore := $date/@notBefore
-        let $notAfter := $date/@notAfter
-        where ($when >= '{date_from}' and $when <= '{date_to}')
-           or ($notBefore and $notAfter and
-               not($notAfter < '{date_from}' or $notBefore > '{date_to}'))
-        order by
-            if ($when) then $when
-            else if ($notBefore) then $notBefore
-            else '0000-00-00'
-        return $item
-        """
-
         try:
-            result = await client.execute_xquery(xquery)
+            result_json = await client.execute_xquery_bytes(
+                CHRONOLOGY_RANGE_XQUERY,
+                how_many=1,
+                variables={"date-from": date_from, "date-to": date_to},
+            )
         except Exception as e:
             raise ToolError(
                 f"Error retrieving chronology from {date_from} to {date_to}: {e}"
             ) from e
 
-        if not result or result.strip() == "":
-            return []
-
-        # Wrap results in root element for parsing
-        wrapped_result = f"<results>{result}</results>"
-
         try:
-            root = etree.fromstring(wrapped_result.encode("utf-8"))
-        except etree.XMLSyntaxError as e:
-            raise ToolError(f"Error parsing chronology XML: {e}") from e
-
-        entries = []
-        for item in root.findall(".//tei:item", TEI_NS):
-            parsed = _parse_chronology_item(item)
-            if parsed:
-                entries.append(parsed)
+            entries = jsonlib.loads(result_json)
+        except json.JSONDecodeError as e:
+            raise ToolError(f"Error parsing chronology result: {e}") from e
 
         if ctx and entries:
             await ctx.info(
@@ -314,67 +332,22 @@ def register_chronology_tools(  # noqa: C901
                 f"Year {year} is outside Schleiermacher's lifetime (1768-1834)"
             )
 
-        if ctx:
-            await ctx.info(f"Fetching chronology for year: {year}")
-
-        client = await get_client()
-
-        # XQuery to load the chronology document for this year directly
-        # Each year has its own XML file: 1768.xml, 1772.xml, etc.
-        xquery = f"""
-        declare namespace tei = "http://www.tei-c.org/ns/1.0";
-
-        let $doc := doc('{settings.sd_data_path}/Chronologie/Chronologie/{year}.xml')
-        return
-            if ($doc) then
-                <year>
-                    <heading>{{$doc//tei:div/tei:head/text()}}</heading>
-                    <items>{{
-                        for $item in $doc//tei:item
-                        return $item
-                    }}</items>
-                </year>
-            else
-                ()
-        """
-
-        try:
-            result = await client.execute_xquery(xquery)
-        except Exception as e:
-            raise ToolError(f"Error retrieving chronology for year {year}: {e}") from e
-
-        if not result or result.strip() == "":
-            raise ToolError(
-                f"No chronology found for year {year}. "
-                f"Chronology covers Schleiermacher's lifetime (1768-1834)."
-            )
+        chronology = _year_cache.get(year)
+        if chronology is None:
+            if ctx:
+                await ctx.info(f"Fetching chronology for year: {year}")
+            lock = _year_locks.setdefault(year, asyncio.Lock())
+            async with lock:
+                # Another request may have loaded the year while we were waiting
+                chronology = _year_cache.get(year)
+                if chronology is None:
+                    chronology = await _fetch_chronology_year(year)
+                    _year_cache[year] = chronology
 
-        try:
-            root = etree.fromstring(result.encode("utf-8"))
-        except etree.XMLSyntaxError as e:
-            raise ToolError(f"Error parsing chronology XML: {e}") from e
-
-        # Extract heading
-        heading_elem = root.find(".//heading")
-        heading = (
-            heading_elem.text if heading_elem is not None else f"Chronology {year}"
-        )
-
-        # Extract all items
-        items_container = root.find(".//items")
-        entries = []
-
-        if items_container is not None:
-            for item in items_container.findall(".//tei:item", TEI_NS):
-                parsed = _parse_chronology_item(item)
-                if parsed:
-                    entries.append(parsed)
+        entries = chronology["entries"]
 
         if ctx:
             await ctx.info(f"Found {len(entries)} entries for year {year}")
 
-        return {
-            "year": year,
-            "heading": heading,
-            "entries": entries,
-        }
+        # Return a copy, so callers cannot alter the cached year
+        return copy.deepcopy(chronology)
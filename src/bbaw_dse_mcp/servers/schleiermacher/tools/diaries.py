@@ -7,32 +7,94 @@ by specific date or date range.
 
 from collections.abc import Awaitable
 from datetime import datetime
-from typing import Protocol, cast
+import json
+from typing import Protocol
 
 from fastmcp import Context, FastMCP
 from fastmcp.exceptions import ToolError
 from lxml import etree
 
-from bbaw_dse_mcp.config.base import TEI_NS, settings
+from bbaw_dse_mcp.config.base import TEI_NAMESPACE, settings
+from bbaw_dse_mcp.utils import jsonlib
 from bbaw_dse_mcp.utils.existdb import ExistDBClient
 
+# Shared parser for query results. Blank text is kept, since the returned
+# TEI entries contain mixed content.
+_PARSER = etree.XMLParser(collect_ids=False, resolve_entities=False)
+
+# Clark-notation tag of the entry element. The entry is the only TEI div
+# among the children of a query result, so no namespace map or @type test
+# is needed
+_TEI_DIV = f"{{{TEI_NAMESPACE}}}div"
+
+
+DIARY_PATH = f"{settings.sd_data_path}/Tageskalender"
+
+# Extracts the text of both page sides of a diary entry, the left one
+# without its tageseintrag date, so Python neither extracts the text nor
+# strips the date prefix.
+DIARY_SIDES_FUNCTION = """
+declare function local:sides($entry as element()) as map(*) {
+    let $left := ($entry//tei:div[@type='linke_seite'])[1]
+    let $left-date := ($left//tei:date[@type='tageseintrag'])[1]
+    return map {
+        "left_side": normalize-space(string-join(
+            $left//text()[not(ancestor::tei:date[. is $left-date])], '')),
+        "right_side": normalize-space(($entry//tei:div[@type='rechte_seite'])[1])
+    }
+};
+"""
 
-class ClientGetter(Protocol):
-    """Protocol for async client getter function."""
-
-    def __call__(self) -> Awaitable[ExistDBClient]: ...
+# Diary entry of one day; the entry is included for its raw XML
+DIARY_ENTRY_XQUERY = f"""
+xquery version "3.1";
+declare namespace tei="http://www.tei-c.org/ns/1.0";
+declare variable $date external;
+{DIARY_SIDES_FUNCTION}
+let $entry := (collection('{DIARY_PATH}')//tei:div[@type='tag'][
+    .//tei:date[@type='tageseintrag'][@when = $date]])[1]
+return
+    if ($entry) then
+        let $sides := local:sides($entry)
+        return
+            <result>
+                <left>{{$sides?left_side}}</left>
+                <right>{{$sides?right_side}}</right>
+                {{$entry}}
+            </result>
+    else
+        ()
+"""
 
+# Diary entries in a date range, ordered by date and serialized as the
+# JSON list returned by the tool
+DIARY_RANGE_XQUERY = f"""
+xquery version "3.1";
+declare namespace tei="http://www.tei-c.org/ns/1.0";
+declare variable $date-from external;
+declare variable $date-to external;
+{DIARY_SIDES_FUNCTION}
+let $entries := array {{
+    for $entry in collection('{DIARY_PATH}')//tei:div[@type='tag']
+    let $date := $entry//tei:date[@type='tageseintrag']/@when
+    where $date >= $date-from and $date <= $date-to
+    order by $date
+    return map:merge((
+        map {{
+            "date": string($date),
+            "year": xs:integer(substring($date, 1, 4))
+        }},
+        local:sides($entry)
+    ))
+}}
+return serialize($entries, map {{"method": "json"}})
+"""
 
-def _extract_text(elem: etree._Element) -> str:
-    """Extract all text content from an XML element.
 
-    Args:
-        elem: XML element
+class ClientGetter(Protocol):
+    """Protocol for async client getter function."""
 
-    Returns:
-        Concatenated text content
-    """
-    return "".join(cast("str", t) for t in elem.itertext()).strip()
+    def __call__(self) -> Awaitable[ExistDBClient]: ...
 
 
 def register_diary_tools(
@@ -90,24 +152,16 @@ def register_diary_tools(
 
         client = await get_client()
 
-        # XQuery to find the specific diary entry
-        xquery = f"""
-        declare namespace tei = "http://www.tei-c.org/ns/1.0";
-
-        let $entry := collection('{settings.sd_data_path}/Tageskalender')//tei:div[@type='tag'][.//tei:date[@type='tageseintrag'][@when='{date}']]
-        return
-            if ($entry) then
-                $entry
-            else
-                ()
-        """
-
         try:
-            result = await client.execute_xquery(xquery)
+            result = await client.execute_xquery(
+                DIARY_ENTRY_XQUERY, how_many=1, variables={"date": date}
+            )
         except Exception as e:
             raise ToolError(f"Error retrieving diary entry for {date}: {e}") from e
 
-        if not result or result.strip() == "":
+        # isspace() stops at the first character of a non-empty result,
+        # while strip() would copy the whole entry
+        if not result or result.isspace():
             raise ToolError(
                 f"No diary entry found for {date}. "
                 f"Diaries are available from 1808 to 1834."
@@ -115,38 +169,24 @@ def register_diary_tools(
 
         # Parse the XML result
         try:
-            entry_elem = etree.fromstring(result.encode("utf-8"))
+            result_elem = etree.fromstring(result.encode("utf-8"), _PARSER)
         except etree.XMLSyntaxError as e:
             raise ToolError(f"Error parsing diary entry XML: {e}") from e
 
-        # Extract left and right side content
-        left_side = entry_elem.find(".//tei:div[@type='linke_seite']", TEI_NS)
-        right_side = entry_elem.find(".//tei:div[@type='rechte_seite']", TEI_NS)
-
-        # Get text content (simplified - just extract text for now)
-        left_text = ""
-        if left_side is not None:
-            # Remove the date element to get only the content
-            date_elem = left_side.find(".//tei:date[@type='tageseintrag']", TEI_NS)
-            date_text = _extract_text(date_elem) if date_elem is not None else date
-
-            # Get all text content
-            left_text = _extract_text(left_side)
-            # Remove date prefix if it's there
-            if date_text and left_text.startswith(date_text):
-                left_text = left_text[len(date_text) :].strip()
-
-        right_text = ""
-        if right_side is not None:
-            right_text = _extract_text(right_side)
+        entry_elem = result_elem.find(_TEI_DIV)
+        left_text = (result_elem.findtext("left") or "").strip()
+        right_text = (result_elem.findtext("right") or "").strip()
 
         return {
             "date": date,
             "year": parsed_date.year,
             "left_side": left_text,
             "right_side": right_text,
+            # The entry keeps the formatting eXist-db serialized it with,
+            # so there is no need to re-indent it
             "raw_xml": etree.tostring(
-                entry_elem, encoding="unicode", pretty_print=True
+                entry_elem if entry_elem is not None else result_elem,
+                encoding="unicode",
             ),
         }
 
@@ -199,90 +239,21 @@ def register_diary_tools(
 
         client = await get_client()
 
-        # XQuery to find diary entries in the date range
-        xquery = f"""
-        declare namespace tei = "http://www.tei-c.org/ns/1.0";
-
-        for $entry in collection('{settings.sd_data_path}/Tageskalender')//tei:div[@type='tag']
-        let $date := $entry//tei:date[@type='tageseintrag']/@when
-        where $date >= '{date_from}' and $date <= '{date_to}'
-        order by $date
-        return
-            <entry>
-                <date>{{string($date)}}</date>
-                <content>{{$entry}}</content>
-            </entry>
-        """
-
         try:
-            result = await client.execute_xquery(xquery)
+            result_json = await client.execute_xquery_bytes(
+                DIARY_RANGE_XQUERY,
+                how_many=1,
+                variables={"date-from": date_from, "date-to": date_to},
+            )
         except Exception as e:
             raise ToolError(
                 f"Error retrieving diary entries from {date_from} to {date_to}: {e}"
             ) from e
 
-        if not result or result.strip() == "":
-            return []
-
-        # Wrap results in root element for parsing
-        wrapped_result = f"<results>{result}</results>"
-
         try:
-            root = etree.fromstring(wrapped_result.encode("utf-8"))
-        except etree.XMLSyntaxError as e:
-            raise ToolError(f"Error parsing diary entries XML: {e}") from e
-
-        entries = []
-        for entry_wrapper in root.findall(".//entry"):
-            date_text = entry_wrapper.find("date")
-            if date_text is None or not date_text.text:
-                continue
-
-            entry_date = date_text.text.strip()
-
-            # Get the content element
-            content = entry_wrapper.find("content")
-            if content is None:
-                continue
-
-            # Find the actual div[@type='tag'] inside
-            entry_elem = content.find(".//tei:div[@type='tag']", TEI_NS)
-            if entry_elem is None:
-                continue
-
-            # Extract left and right side content
-            left_side = entry_elem.find(".//tei:div[@type='linke_seite']", TEI_NS)
-            right_side = entry_elem.find(".//tei:div[@type='rechte_seite']", TEI_NS)
-
-            # Get text content
-            left_text = ""
-            if left_side is not None:
-                # Remove the date element to get only the content
-                date_elem = left_side.find(".//tei:date[@type='tageseintrag']", TEI_NS)
-                date_display_text = (
-                    _extract_text(date_elem) if date_elem is not None else entry_date
-                )
-
-                # Get all text content
-                left_text = _extract_text(left_side)
-                # Remove date prefix if it's there
-                if date_display_text and left_text.startswith(date_display_text):
-                    left_text = left_text[len(date_display_text) :].strip()
-
-            right_text = ""
-            if right_side is not None:
-                right_text = _extract_text(right_side)
-
-            parsed_date = datetime.fromisoformat(entry_date)
-
-            entries.append(
-                {
-                    "date": entry_date,
-                    "year": parsed_date.year,
-                    "left_side": left_text,
-                    "right_side": right_text,
-                }
-            )
+            entries = jsonlib.loads(result_json)
+        except json.JSONDecodeError as e:
+            raise ToolError(f"Error parsing diary entries result: {e}") from e
 
         if ctx:
             await ctx.info(f"Found {len(entries)} diary entries")
@@ -5,6 +5,7 @@ This module provides tools for retrieving and displaying full documents
 (letters, diary entries, lectures) from the Schleiermacher edition.
 """
 
+import asyncio
 from collections.abc import Awaitable
 from typing import Protocol
 
@@ -13,7 +14,7 @@ from fastmcp.exceptions import ToolError
 from lxml import etree
 
 from bbaw_dse_mcp.config.base import settings
-from bbaw_dse_mcp.servers.schleiermacher.resources.documents import determine_doctype
+from bbaw_dse_mcp.servers.schleiermacher.resources.documents import document_cache
 from bbaw_dse_mcp.servers.schleiermacher.utils.documents import (
     format_generic_document_as_markdown,
     parse_generic_document,
@@ -23,6 +24,7 @@ from bbaw_dse_mcp.servers.schleiermacher.utils.letters import (
     parse_letter,
 )
 from bbaw_dse_mcp.utils.existdb import DocumentNotFoundError, ExistDBClient
+from bbaw_dse_mcp.utils.tei import determine_doctype_cached
 
 
 class ClientGetter(Protocol):
@@ -70,6 +72,10 @@ def register_docs_tools(
         if not document_id:
             raise ToolError("document_id is required")
 
+        cached = document_cache.get(document_id)
+        if cached is not None:
+            return cached
+
         if ctx:
             await ctx.info(f"Fetching document: {document_id}")
 
@@ -86,23 +92,28 @@ def register_docs_tools(
             raise ToolError(f"Error retrieving '{document_id}': {e}") from e
 
         # Determine document type for processing
-        doctype = determine_doctype(xml_str)
+        doctype = determine_doctype_cached(document_id, xml_str)
 
         if doctype == "letter fs":
-            # Parse using comprehensive letter parser
+            # Parse using comprehensive letter parser, in a worker thread so
+            # large documents do not block the event loop
             try:
-                letter = parse_letter(xml_str, document_id)
-                return format_letter_as_markdown(letter)
+                letter = await asyncio.to_thread(parse_letter, xml_str, document_id)
+                markdown = format_letter_as_markdown(letter)
             except (etree.XMLSyntaxError, AttributeError, KeyError, ValueError) as e:
                 raise ToolError(f"Error processing '{document_id}': {e}") from e
+            document_cache.set(document_id, markdown)
+            return markdown
 
         # Handle other document types (lecture, diary, etc.) with generic parser
         if doctype:
             try:
-                doc = parse_generic_document(xml_str, document_id)
-                return format_generic_document_as_markdown(doc)
+                doc = await asyncio.to_thread(parse_generic_document, xml_str, document_id)
+                markdown = format_generic_document_as_markdown(doc)
             except (etree.XMLSyntaxError, AttributeError, KeyError, ValueError) as e:
                 raise ToolError(f"Error processing '{document_id}': {e}") from e
+            document_cache.set(document_id, markdown)
+            return markdown
 
         # Fallback if no doctype found
         raise ToolError(f"Document '{document_id}' has no recognized type")
@@ -5,16 +5,17 @@ This module provides tools for searching and retrieving register entries
 (persons, places, works) from the Schleiermacher edition.
 """
 
+import asyncio
 import json
+import logging
 import re
 from collections.abc import Awaitable
 from typing import Protocol
 
 from fastmcp import Context, FastMCP
 from fastmcp.exceptions import ToolError
-from lxml import etree
 
-from bbaw_dse_mcp.config.base import TEI_NS, settings
+from bbaw_dse_mcp.config.base import settings
 from bbaw_dse_mcp.schemas.schleiermacher.register import (
     CorrespondenceSummary,
     DocumentMention,
@@ -25,8 +26,212 @@ from bbaw_dse_mcp.schemas.schleiermacher.register import (
     WorkAuthor,
     WorkEntry,
 )
+from bbaw_dse_mcp.servers.schleiermacher.utils.letters import LetterRegisterIndex
+from bbaw_dse_mcp.utils import jsonlib
+from bbaw_dse_mcp.utils.cache import TTLCache
 from bbaw_dse_mcp.utils.existdb import ExistDBClient
 
+logger = logging.getLogger(__name__)
+
+# Collection holding the register entries
+REGISTER_PATH = f"{settings.sd_data_path}/Register"
+
+# LRU cache of register entries as (doc type, entry fields), keyed by entry ID.
+# Register entries change rarely, so a short TTL is enough to pick up edits.
+ENTRY_CACHE_SIZE = 2048
+ENTRY_CACHE_TTL = 600.0
+_entry_cache: TTLCache[str, tuple[str, dict]] = TTLCache(ENTRY_CACHE_SIZE, ENTRY_CACHE_TTL)
+
+# Accepted format of register entry IDs: an xml:id (NCName, so no colon and
+# no leading digit, dot or hyphen) of at most 64 characters. IDs are spliced
+# into the Lucene field queries for mentions, where a colon would be read as
+# a field separator, so anything else is rejected.
+ENTRY_ID_PATTERN = re.compile(r"[A-Za-z_][A-Za-z0-9_.\-]{0,63}")
+
+# Lucene fields of diaries and lectures holding references to register
+# entries, per entity type: (text fields, comment fields)
+MENTION_FIELDS = {
+    "person": (
+        ("text-person-keys", "text-rs-person-keys", "text-index-person-keys"),
+        ("comment-person-keys", "comment-rs-person-keys"),
+    ),
+    "place": (("text-place-keys",), ("comment-place-keys",)),
+}
+
+# Runs of whitespace collapsed in search result fields
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+# Indexed register element of each register type
+REGISTER_ELEMENTS = {
+    "person": "tei:person",
+    "place": "tei:place",
+    "org": "tei:org",
+    "work": "tei:bibl",
+}
+
+
+def _search_xquery(element_path: str) -> str:
+    """Build the Lucene register search over the given element path."""
+    # CRITICAL: fields must be requested in options map for ft:field() to work
+    return f"""
+xquery version "3.1";
+declare namespace tei="http://www.tei-c.org/ns/1.0";
+declare namespace ft="http://exist-db.org/xquery/lucene";
+declare variable $query external;
+declare variable $max-results external;
+
+let $options := map {{ "fields": ("id", "title", "desc", "doc-type", "fulltext") }}
+let $hits := collection('{REGISTER_PATH}'){element_path}[ft:query(., $query, $options)]
+(: Rank the bare hits, then build results only for the best ones :)
+let $ranked :=
+    for $hit in $hits
+    order by ft:score($hit) descending
+    return $hit
+let $results := array {{
+    for $hit in subsequence($ranked, 1, $max-results)
+    let $score := ft:score($hit)
+    return map {{
+        "id": ft:field($hit, 'id')[1],
+        "title": ft:field($hit, 'title')[1],
+        "desc": ft:field($hit, 'desc')[1],
+        "type": ft:field($hit, 'doc-type')[1],
+        "fulltext": ft:field($hit, 'fulltext')[1],
+        "score": $score
+    }}
+}}
+return serialize($results, map {{ "method": "json" }})
+"""
+
+
+# Register search per register type. The index only exists for specific
+# element types, so searching all types uses a union of them (key None).
+SEARCH_XQUERIES: dict[str | None, str] = {
+    register_type: _search_xquery(f"//{element}")
+    for register_type, element in REGISTER_ELEMENTS.items()
+}
+SEARCH_XQUERIES[None] = _search_xquery("//(tei:person | tei:place | tei:org | tei:bibl)")
+
+# Lucene doc-type field and fields of a register entry as one JSON object,
+# or nothing if the entry does not exist or has no doc type. Entries of
+# types other than person, place and work are returned as serialized XML.
+# Text values are the leading text of an element, or null if it has none.
+ENTRY_XQUERY = f"""
+xquery version "3.1";
+declare namespace tei="http://www.tei-c.org/ns/1.0";
+declare namespace ft="http://exist-db.org/xquery/lucene";
+declare variable $entry-id external;
+
+declare function local:text($elem as element()?) as xs:string? {{
+    $elem/node()[1][self::text()]/string()
+}};
+
+let $hit := (collection('{REGISTER_PATH}')//*[@xml:id = $entry-id])[1]
+let $doc-type := if (exists($hit)) then normalize-space(ft:field($hit, 'doc-type')[1]) else ''
+return
+    if ($doc-type = '') then ()
+    else serialize(map {{
+        "type": $doc-type,
+        "entry": switch ($doc-type)
+            case "person" return
+                let $reg := ($hit//tei:persName[@type='reg'])[1]
+                return map {{
+                    "surname": local:text($reg/tei:surname[1]),
+                    "forename": local:text($reg/tei:forename[1]),
+                    "birth": local:text(($hit//tei:birth)[1]),
+                    "death": local:text(($hit//tei:death)[1]),
+                    "note": local:text(($hit//tei:note)[1]),
+                    "gnd": $hit/@corresp/string()
+                }}
+            case "place" return map {{
+                "name": local:text(($hit//tei:placeName[@type='reg'])[1]),
+                "place_type": $hit/@type/string(),
+                "geonames_uri": local:text(($hit//tei:idno[@type='uri'])[1]),
+                "note": local:text(($hit//tei:note)[1])
+            }}
+            case "work" return
+                let $author := ($hit//tei:author/tei:persName)[1]
+                let $pub-place := ($hit//tei:pubPlace)[1]
+                return map {{
+                    "title": local:text(($hit//tei:title)[1]),
+                    "author":
+                        if (empty($author)) then ()
+                        else map {{
+                            "key": $author/@key/string(),
+                            "surname": local:text($author/tei:surname[1]),
+                            "forename": local:text($author/tei:forename[1])
+                        }},
+                    "date": local:text(($hit//tei:date)[1]),
+                    "pub_place": local:text($pub-place),
+                    "pub_place_key": $pub-place/@key/string(),
+                    "note": local:text(($hit//tei:note)[1])
+                }}
+            default return map {{ "xml": serialize($hit) }}
+    }}, map {{ "method": "json" }})
+"""
+
+# Diary documents mentioning an entity in text or commentary
+DIARY_MENTIONS_XQUERY = f"""
+xquery version "3.1";
+declare namespace tei="http://www.tei-c.org/ns/1.0";
+declare namespace ft="http://exist-db.org/xquery/lucene";
+declare variable $text-query external;
+declare variable $any-query external;
+declare variable $max-results external;
+
+let $allHits := collection('{settings.sd_data_path}/Tageskalender')//tei:TEI[ft:query(., $any-query)]
+let $limited := subsequence($allHits, 1, $max-results)
+return serialize(map {{
+    "total": count($allHits),
+    "items": array {{
+        for $doc in $limited
+        let $id := string($doc/@xml:id)
+        let $title := string(($doc//tei:titleStmt/tei:title)[1])
+        let $date := string(($doc//tei:creation/tei:date/@when)[1])
+        (: Every hit matches the text or the comment query, so a per-document
+           index probe of the text query classifies it :)
+        let $inText := exists($doc[ft:query(., $text-query)])
+        order by $date
+        return map {{
+            "id": $id,
+            "title": $title,
+            "date": $date,
+            "mentionType": if ($inText) then "text" else "comment"
+        }}
+    }}
+}}, map {{ "method": "json" }})
+"""
+
+# Lecture documents mentioning an entity in text or commentary
+LECTURE_MENTIONS_XQUERY = f"""
+xquery version "3.1";
+declare namespace tei="http://www.tei-c.org/ns/1.0";
+declare namespace ft="http://exist-db.org/xquery/lucene";
+declare variable $text-query external;
+declare variable $any-query external;
+declare variable $max-results external;
+
+let $allHits := collection('{settings.sd_data_path}/Vorlesungen')//tei:TEI[ft:query(., $any-query)]
+let $limited := subsequence($allHits, 1, $max-results)
+return serialize(map {{
+    "total": count($allHits),
+    "items": array {{
+        for $doc in $limited
+        let $id := string($doc/@xml:id)
+        let $title := string(($doc//tei:titleStmt/tei:title)[1])
+        (: Every hit matches the text or the comment query, so a per-document
+           index probe of the text query classifies it :)
+        let $inText := exists($doc[ft:query(., $text-query)])
+        order by $title
+        return map {{
+            "id": $id,
+            "title": $title,
+            "date": (),
+            "mentionType": if ($inText) then "text" else "comment"
+        }}
+    }}
+}}, map {{ "method": "json" }})
+"""
+
 
 class ClientGetter(Protocol):
     """Protocol for async client getter function."""
@@ -34,15 +239,34 @@ class ClientGetter(Protocol):
     def __call__(self) -> Awaitable[ExistDBClient]: ...
 
 
+class IndexGetter(Protocol):
+    """Protocol for async letter register index getter function."""
+
+    def __call__(self) -> Awaitable[LetterRegisterIndex]: ...
+
+
+def _clean_text(text: str | None) -> str | None:
+    """Remove linebreaks and collapse whitespace."""
+    if not text:
+        return None
+    # Printable text has no whitespace other than ASCII spaces, so without
+    # double spaces it only needs stripping, not a regex pass
+    if "  " not in text and text.isprintable():
+        return text.strip()
+    return WHITESPACE_PATTERN.sub(" ", text).strip()
+
+
 def register_register_tools(
     mcp: FastMCP,
     get_client: ClientGetter,
+    get_letter_index: IndexGetter,
 ) -> None:
     """Register register-related tools on the given MCP server.
 
     Args:
         mcp: The FastMCP server instance to register tools on
         get_client: Async function that returns an ExistDBClient
+        get_letter_index: Async function that returns the letter register index
     """
 
     @mcp.tool
@@ -76,79 +300,42 @@ def register_register_tools(
         if not query:
             raise ToolError("query is required")
 
+        if register_type and register_type not in REGISTER_ELEMENTS:
+            raise ToolError(
+                f"Unknown register_type '{register_type}'. "
+                f"Use one of: {', '.join(REGISTER_ELEMENTS)}"
+            )
+
         if ctx:
             type_info = f" in {register_type}" if register_type else " across all types"
             await ctx.info(f"Searching register{type_info} for: {query}")
 
         client = await get_client()
 
-        # Build element path - index only exists for specific element types
-        if register_type:
-            type_map = {
-                "person": "tei:person",
-                "place": "tei:place",
-                "org": "tei:org",
-                "work": "tei:bibl",
-            }
-            element_path = f"//{type_map.get(register_type, f'tei:{register_type}')}"
-        else:
-            # Use union to query all indexed types
-            element_path = "//(tei:person | tei:place | tei:org | tei:bibl)"
-
-        # Use Lucene fulltext search with indexed fields
-        # CRITICAL: fields must be requested in options map for ft:field() to work
-        xquery = f"""
-        xquery version "3.1";
-        declare namespace tei="http://www.tei-c.org/ns/1.0";
-        declare namespace ft="http://exist-db.org/xquery/lucene";
-
-        let $options := map {{ "fields": ("id", "title", "desc", "doc-type", "fulltext") }}
-        let $hits := collection('{settings.sd_data_path}/Register'){element_path}[ft:query(., '{query}', $options)]
-        let $results := array {{
-            for $hit in $hits
-            let $score := ft:score($hit)
-            order by $score descending
-            return map {{
-                "id": ft:field($hit, 'id')[1],
-                "title": ft:field($hit, 'title')[1],
-                "desc": ft:field($hit, 'desc')[1],
-                "type": ft:field($hit, 'doc-type')[1],
-                "fulltext": ft:field($hit, 'fulltext')[1],
-                "score": $score
-            }}
-        }}
-        return serialize($results, map {{ "method": "json" }})
-        """
-
         try:
-            result = await client.execute_xquery(xquery.strip(), how_many=max_results)
+            result = await client.execute_xquery_bytes(
+                SEARCH_XQUERIES[register_type],
+                how_many=max_results,
+                variables={"query": query, "max-results": max_results},
+            )
         except Exception as e:
             raise ToolError(f"Register search failed: {e}") from e
 
         # Parse JSON result
-        def clean_text(text: str | None) -> str | None:
-            """Remove linebreaks and collapse whitespace."""
-            if not text:
-                return None
-            return re.sub(r"\s+", " ", text).strip()
-
         try:
-            entries = json.loads(result)
-            # Limit results and clean up
-            return [
-                {
-                    "id": e.get("id"),
-                    "title": clean_text(e.get("title")),
-                    "desc": clean_text(e.get("desc")),
-                    "type": e.get("type"),
-                    "fulltext": clean_text(e.get("fulltext")),
-                }
-                for e in entries[:max_results]
-            ]
+            entries = jsonlib.loads(result)[:max_results]
         except json.JSONDecodeError:
             # Fallback if no results
             return []
 
+        # Clean up the decoded entries in place; the score is only for ranking
+        for entry in entries:
+            entry["title"] = _clean_text(entry.get("title"))
+            entry["desc"] = _clean_text(entry.get("desc"))
+            entry["fulltext"] = _clean_text(entry.get("fulltext"))
+            entry.pop("score", None)
+        return entries
+
     @mcp.tool
     async def get_register_entry(
         entry_id: str,
@@ -179,6 +366,10 @@ def register_register_tools(
         """
         if not entry_id:
             raise ToolError("entry_id is required")
+        if not ENTRY_ID_PATTERN.fullmatch(entry_id):
+            raise ToolError(
+                f"Invalid entry_id '{entry_id}'. Expected an ID like 'S0003676'"
+            )
 
         if ctx:
             mention_info = " with mentions" if include_mentions else ""
@@ -186,50 +377,29 @@ def register_register_tools(
 
         client = await get_client()
 
-        # First, find which type this entry is using Lucene index
-        type_query = f"""
-        xquery version "3.1";
-        declare namespace tei="http://www.tei-c.org/ns/1.0";
-        declare namespace ft="http://exist-db.org/xquery/lucene";
-
-        let $hit := collection('{settings.sd_data_path}/Register')//*[@xml:id='{entry_id}']
-        return if ($hit) then
-            ft:field($hit, 'doc-type')
-        else
-            ''
-        """
-
-        try:
-            doc_type_result = await client.execute_xquery(type_query.strip())
-            doc_type = doc_type_result.strip()
-
-            if not doc_type:
+        cached = _entry_cache.get(entry_id)
+        if cached is not None:
+            doc_type, entry = cached
+        else:
+            # Doc type (from the Lucene index) and fields in one round trip
+            try:
+                result_json = await client.execute_xquery_bytes(
+                    ENTRY_XQUERY, variables={"entry-id": entry_id}
+                )
+            except Exception as e:
+                raise ToolError(f"Error retrieving '{entry_id}': {e}") from e
+
+            if not result_json.strip():
                 raise ToolError(f"Register entry '{entry_id}' not found")
 
-        except Exception as e:
-            raise ToolError(f"Error retrieving type for '{entry_id}': {e}") from e
+            try:
+                result = jsonlib.loads(result_json)
+            except json.JSONDecodeError as e:
+                raise ToolError(f"Error parsing register entry '{entry_id}': {e}") from e
 
-        # Now get the full entry XML
-        xquery = f"""
-        xquery version "3.1";
-        declare namespace tei="http://www.tei-c.org/ns/1.0";
-
-        collection('{settings.sd_data_path}/Register')//*[@xml:id='{entry_id}']
-        """
-
-        try:
-            xml_result = await client.execute_xquery(xquery.strip())
-        except Exception as e:
-            raise ToolError(f"Error retrieving '{entry_id}': {e}") from e
-
-        if not xml_result.strip():
-            raise ToolError(f"Register entry '{entry_id}' not found")
-
-        # Parse the XML
-        try:
-            root = etree.fromstring(xml_result.encode("utf-8"))
-        except etree.XMLSyntaxError as e:
-            raise ToolError(f"XML parsing failed: {e}") from e
+            doc_type = result["type"]
+            entry = result["entry"]
+            _entry_cache.set(entry_id, (doc_type, entry))
 
         # Fetch mentions if requested
         mentions: MentionsSummary | None = None
@@ -237,47 +407,37 @@ def register_register_tools(
             if ctx:
                 await ctx.report_progress(50, 100)
                 await ctx.info(f"Fetching mentions for {doc_type} {entry_id}...")
-            mentions = await _fetch_mentions(client, entry_id, doc_type, max_mentions)
+            mentions = await _fetch_mentions(
+                client, get_letter_index, entry_id, doc_type, max_mentions
+            )
 
-        # Parse based on type
+        # Build based on type
         if doc_type == "person":
-            person_entry = _parse_person_entry(root, entry_id)
+            person_entry = _person_entry(entry, entry_id)
             person_entry.mentions = mentions
             return person_entry
         if doc_type == "place":
-            place_entry = _parse_place_entry(root, entry_id)
+            place_entry = _place_entry(entry, entry_id)
             place_entry.mentions = mentions
             return place_entry
         if doc_type == "work":
-            return _parse_work_entry(root, entry_id)
+            return _work_entry(entry, entry_id)
         # Fallback to dict for unknown types
         return {
             "id": entry_id,
             "type": doc_type,
-            "xml": xml_result,
+            "xml": entry["xml"],
         }
 
 
-# Helper functions for parsing register entries
+# Helper functions for building register entries
 
 
-def _parse_person_entry(
-    root: etree._Element,
-    entry_id: str,
-) -> PersonEntry:
-    """Parse a person entry from XML."""
-    # Extract main name
-    reg_name = root.find(".//tei:persName[@type='reg']", TEI_NS)
-    surname = None
-    forename = None
-    full_name = ""
-
-    if reg_name is not None:
-        surname_elem = reg_name.find("tei:surname", TEI_NS)
-        forename_elem = reg_name.find("tei:forename", TEI_NS)
-        surname = surname_elem.text if surname_elem is not None else None
-        forename = forename_elem.text if forename_elem is not None else None
-        full_name = f"{surname or ''}, {forename or ''}".strip(", ")
+def _person_entry(entry: dict, entry_id: str) -> PersonEntry:
+    """Build a person entry from the fields returned by ENTRY_XQUERY."""
+    surname = entry["surname"]
+    forename = entry["forename"]
+    full_name = f"{surname or ''}, {forename or ''}".strip(", ")
 
     name = PersonName(
         surname=surname,
@@ -285,121 +445,116 @@ def _parse_person_entry(
         full_name=full_name or "Unknown",
     )
 
-    # Life dates
-    birth_elem = root.find(".//tei:birth", TEI_NS)
-    death_elem = root.find(".//tei:death", TEI_NS)
-    birth = birth_elem.text if birth_elem is not None else None
-    death = death_elem.text if death_elem is not None else None
-
-    # Note
-    note_elem = root.find(".//tei:note", TEI_NS)
-    note = note_elem.text if note_elem is not None else None
-
-    # GND
-    gnd = root.get("corresp")
-
     # TODO: Parse alternative names if needed
 
     return PersonEntry(
         id=entry_id,
         name=name,
-        birth=birth,
-        death=death,
-        gnd=gnd,
-        note=note,
+        birth=entry["birth"],
+        death=entry["death"],
+        gnd=entry["gnd"],
+        note=entry["note"],
     )
 
 
-def _parse_place_entry(root: etree._Element, entry_id: str) -> PlaceEntry:
-    """Parse a place entry from XML."""
-    # Extract place name
-    place_name_elem = root.find(".//tei:placeName[@type='reg']", TEI_NS)
-    name = (
-        (place_name_elem.text or "Unknown")
-        if place_name_elem is not None
-        else "Unknown"
-    )
-
-    # GND/Geonames
-    geonames_elem = root.find(".//tei:idno[@type='uri']", TEI_NS)
-    geonames_uri = geonames_elem.text if geonames_elem is not None else None
-
-    # Note
-    note_elem = root.find(".//tei:note", TEI_NS)
-    note = note_elem.text if note_elem is not None else None
-
-    # Place type
-    place_type = root.get("type")
-
+def _place_entry(entry: dict, entry_id: str) -> PlaceEntry:
+    """Build a place entry from the fields returned by ENTRY_XQUERY."""
     # TODO: Parse alternative names and sub-places if needed
 
     return PlaceEntry(
         id=entry_id,
-        name=name,
-        place_type=place_type,
-        geonames_uri=geonames_uri,
-        note=note,
+        name=entry["name"] or "Unknown",
+        place_type=entry["place_type"],
+        geonames_uri=entry["geonames_uri"],
+        note=entry["note"],
     )
 
 
-def _parse_work_entry(root: etree._Element, entry_id: str) -> WorkEntry:
-    """Parse a work entry from XML."""
-    # Extract title
-    title_elem = root.find(".//tei:title", TEI_NS)
-    title = title_elem.text if title_elem is not None else ""
-
-    # Extract author
-    author_elem = root.find(".//tei:author/tei:persName", TEI_NS)
-    author = None
-    if author_elem is not None:
-        surname_elem = author_elem.find("tei:surname", TEI_NS)
-        forename_elem = author_elem.find("tei:forename", TEI_NS)
-        author = WorkAuthor(
-            key=author_elem.get("key"),
-            surname=surname_elem.text if surname_elem is not None else None,
-            forename=forename_elem.text if forename_elem is not None else None,
-        )
-
-    # Date
-    date_elem = root.find(".//tei:date", TEI_NS)
-    date = date_elem.text if date_elem is not None else None
-
-    # Publication place
-    pub_place_elem = root.find(".//tei:pubPlace", TEI_NS)
-    pub_place = pub_place_elem.text if pub_place_elem is not None else None
-    pub_place_key = pub_place_elem.get("key") if pub_place_elem is not None else None
-
-    # Note
-    note_elem = root.find(".//tei:note", TEI_NS)
-    note = note_elem.text if note_elem is not None else None
+def _work_entry(entry: dict, entry_id: str) -> WorkEntry:
+    """Build a work entry from the fields returned by ENTRY_XQUERY."""
+    author = WorkAuthor(**entry["author"]) if entry["author"] else None
 
     return WorkEntry(
         id=entry_id,
         author=author,
-        title=title or "Unknown",
-        date=date,
-        pub_place=pub_place,
-        pub_place_key=pub_place_key,
-        note=note,
+        title=entry["title"] or "Unknown",
+        date=entry["date"],
+        pub_place=entry["pub_place"],
+        pub_place_key=entry["pub_place_key"],
+        note=entry["note"],
     )
 
 
 # ==================== MENTION FETCHING ====================
 
 
+def _build_field_queries(entity_type: str, entry_id: str) -> tuple[str, str]:
+    """Build the Lucene text and comment queries for mentions of an entry.
+
+    Args:
+        entity_type: 'person' or 'place'
+        entry_id: xml:id of the register entry, validated by ENTRY_ID_PATTERN
+
+    Returns:
+        Text query and comment query
+    """
+    text_fields, comment_fields = MENTION_FIELDS[entity_type]
+    return (
+        " OR ".join(f"{field}:{entry_id}" for field in text_fields),
+        " OR ".join(f"{field}:{entry_id}" for field in comment_fields),
+    )
+
+
+async def _fetch_document_mentions(
+    client: ExistDBClient,
+    xquery: str,
+    variables: dict[str, str | int],
+    doc_type: str,
+) -> tuple[list[DocumentMention], int]:
+    """Fetch documents mentioning an entity using the Lucene index.
+
+    Args:
+        client: ExistDB client
+        xquery: DIARY_MENTIONS_XQUERY or LECTURE_MENTIONS_XQUERY
+        variables: Lucene field queries and result limit to bind
+        doc_type: Document type of the returned mentions
+
+    Returns:
+        Document mentions and their total
+    """
+    result = await client.execute_xquery_bytes(xquery, variables=variables)
+    data = jsonlib.loads(result) if result.strip() else {}
+    mentions = [
+        DocumentMention(
+            id=item.get("id", ""),
+            title=item.get("title", ""),
+            date=item.get("date"),
+            doc_type=doc_type,
+            mention_type=item.get("mentionType", "text"),
+        )
+        for item in data.get("items", [])
+    ]
+    return mentions, data.get("total", 0)
+
+
 async def _fetch_mentions(
     client: ExistDBClient,
+    get_letter_index: IndexGetter,
     entry_id: str,
     entity_type: str,
     max_results: int = 20,
 ) -> MentionsSummary:
     """Fetch mentions of an entity across letters, diaries, lectures.
 
-    For letters: Uses JSON cache at /db/projects/schleiermacher/cache/letters/register/
+    For letters: Uses the in-memory index of the JSON letter cache at
+    /db/projects/schleiermacher/cache/letters/register/
     For diaries/lectures: Uses Lucene indexed fields
 
+    The sources are queried concurrently.
+
     Args:
         client: ExistDB client
+        get_letter_index: Async function that returns the letter register index
         entry_id: xml:id of the register entry
         entity_type: 'person' or 'place'
         max_results: Max items per category to return
@@ -407,244 +562,61 @@ async def _fetch_mentions(
     Returns:
         MentionsSummary with counts and sample documents
     """
+    text_query, comment_query = _build_field_queries(entity_type, entry_id)
+    mention_variables: dict[str, str | int] = {
+        "text-query": text_query,
+        "any-query": f"({text_query}) OR ({comment_query})",
+        "max-results": max_results,
+    }
+
+    index_result, diary_result, lecture_result = await asyncio.gather(
+        get_letter_index(),
+        _fetch_document_mentions(
+            client, DIARY_MENTIONS_XQUERY, mention_variables, "diary"
+        ),
+        _fetch_document_mentions(
+            client, LECTURE_MENTIONS_XQUERY, mention_variables, "lecture"
+        ),
+        return_exceptions=True,
+    )
+
+    # Each source is non-critical, a failed one just contributes no mentions.
+    # Cancellation and other BaseExceptions abort the whole lookup
+    for source, result in (
+        ("letter index", index_result),
+        ("diaries", diary_result),
+        ("lectures", lecture_result),
+    ):
+        if isinstance(result, Exception):
+            logger.warning(f"Fetching {source} mentions of {entry_id} failed: {result}")
+        elif isinstance(result, BaseException):
+            raise result
+
+    correspondence: CorrespondenceSummary | None = None
     letters: list[DocumentMention] = []
     diaries: list[DocumentMention] = []
     lectures: list[DocumentMention] = []
-    correspondence: CorrespondenceSummary | None = None
     total_letters = 0
     total_diaries = 0
     total_lectures = 0
-
-    # ===== LETTERS: Use JSON cache for performance =====
-    # The cache contains all letter metadata + mentions for each entity
-    # Note: sender/receiver can be either a single object or an array
-    letter_cache_xquery = f"""
-    xquery version "3.1";
-
-    let $cacheFile := '{settings.sd_cache_path}/letters/register/letters-for-register.json'
-    let $jsonData := parse-json(util:binary-to-string(util:binary-doc($cacheFile)))
-    let $letterArray := $jsonData("letter")
-    let $entityType := '{entity_type}'
-    let $entityId := '{entry_id}'
-
-    (: Helper to check if sender/receiver matches - handles both object and array :)
-    let $matchesSender := function($data, $id) {{
-        let $sender := $data("sender")
-        return
-            if (empty($sender)) then false()
-            else if ($sender instance of array(*)) then
-                some $s in array:flatten($sender) satisfies $s("senderRef") = $id
-            else if ($sender instance of map(*)) then
-                $sender("senderRef") = $id
-            else false()
-    }}
-
-    let $matchesReceiver := function($data, $id) {{
-        let $receiver := $data("receiver")
-        return
-            if (empty($receiver)) then false()
-            else if ($receiver instance of array(*)) then
-                some $r in array:flatten($receiver) satisfies $r("receiverRef") = $id
-            else if ($receiver instance of map(*)) then
-                $receiver("receiverRef") = $id
-            else false()
-    }}
-
-    (: Count correspondence (sender/receiver) for persons :)
-    let $senderCount :=
-        if ($entityType = 'person') then
-            count(
-                for $i in 1 to array:size($letterArray)
-                let $entry := array:get($letterArray, $i)
-                let $data := $entry("data")
-                where $matchesSender($data, $entityId)
-                return 1
-            )
-        else 0
-
-    let $recipientCount :=
-        if ($entityType = 'person') then
-            count(
-                for $i in 1 to array:size($letterArray)
-                let $entry := array:get($letterArray, $i)
-                let $data := $entry("data")
-                where $matchesReceiver($data, $entityId)
-                return 1
-            )
-        else 0
-
-    (: Find letters with mentions of this entity :)
-    let $mentionLetters :=
-        for $i in 1 to array:size($letterArray)
-        let $entry := array:get($letterArray, $i)
-        let $data := $entry("data")
-        let $mentions := $data("mentions")
-        where exists($mentions) and $mentions instance of map(*)
-        let $entityMentions :=
-            if ($entityType = 'person') then
-                let $persons := $mentions("persons")
-                return if (exists($persons) and $persons instance of map(*)) then $persons("person") else ()
-            else if ($entityType = 'place') then
-                let $places := $mentions("places")
-                return if (exists($places) and $places instance of map(*)) then $places("place") else ()
-            else ()
-        where exists($entityMentions) and $entityMentions instance of array(*)
-        let $matchingMentions :=
-            for $mention in array:flatten($entityMentions)
-            where $mention instance of map(*) and $mention("id") = $entityId
-            return $mention
-        where exists($matchingMentions)
-        let $mentionType :=
-            if (some $m in $matchingMentions satisfies $m("type") = "regular") then "text"
-            else "comment"
-        order by $data("date_iso")
-        return map {{
-            "id": $data("id"),
-            "title": concat("Brief ", $data("idno"), ": ", $data("dateDisplay")),
-            "date": $data("date_iso"),
-            "mentionType": $mentionType
-        }}
-
-    return serialize(map {{
-        "senderCount": $senderCount,
-        "recipientCount": $recipientCount,
-        "correspondenceTotal": $senderCount + $recipientCount,
-        "mentionTotal": count($mentionLetters),
-        "mentions": array {{ subsequence($mentionLetters, 1, {max_results}) }}
-    }}, map {{ "method": "json" }})
-    """
-
-    try:
-        result = await client.execute_xquery(letter_cache_xquery.strip())
-        data = json.loads(result) if result.strip() else {}
-
+    if not isinstance(index_result, BaseException):
         # Correspondence stats (persons only)
         if entity_type == "person":
+            senders = index_result.senders[entry_id]
+            recipients = index_result.recipients[entry_id]
             correspondence = CorrespondenceSummary(
                 person_id=entry_id,
-                letters_as_sender=data.get("senderCount", 0),
-                letters_as_recipient=data.get("recipientCount", 0),
-                total_letters=data.get("correspondenceTotal", 0),
-            )
-
-        # Letter mentions
-        total_letters = data.get("mentionTotal", 0)
-        letters = [
-            DocumentMention(
-                id=item.get("id", ""),
-                title=item.get("title", ""),
-                date=item.get("date"),
-                doc_type="letter",
-                mention_type=item.get("mentionType", "text"),
-            )
-            for item in data.get("mentions", [])
-        ]
-    except Exception:
-        pass  # Non-critical, continue with other sources
-
-    # ===== DIARIES & LECTURES: Use Lucene index =====
-    # Build field queries based on entity type
-    if entity_type == "person":
-        text_query = (
-            f"text-person-keys:{entry_id} OR "
-            f"text-rs-person-keys:{entry_id} OR "
-            f"text-index-person-keys:{entry_id}"
-        )
-        comment_query = (
-            f"comment-person-keys:{entry_id} OR " f"comment-rs-person-keys:{entry_id}"
-        )
-    else:
-        text_query = f"text-place-keys:{entry_id}"
-        comment_query = f"comment-place-keys:{entry_id}"
-
-    # Query for diary mentions
-    diary_xquery = f"""
-    xquery version "3.1";
-    declare namespace tei="http://www.tei-c.org/ns/1.0";
-    declare namespace ft="http://exist-db.org/xquery/lucene";
-
-    let $textHits := collection('{settings.sd_data_path}/Tageskalender')//tei:TEI[ft:query(., '{text_query}')]
-    let $commentHits := collection('{settings.sd_data_path}/Tageskalender')//tei:TEI[ft:query(., '{comment_query}')]
-    let $allHits := ($textHits | $commentHits)
-    let $limited := subsequence($allHits, 1, {max_results})
-    return serialize(map {{
-        "total": count($allHits),
-        "items": array {{
-            for $doc in $limited
-            let $id := string($doc/@xml:id)
-            let $title := string(($doc//tei:titleStmt/tei:title)[1])
-            let $date := string(($doc//tei:creation/tei:date/@when)[1])
-            let $inText := $doc = $textHits
-            order by $date
-            return map {{
-                "id": $id,
-                "title": $title,
-                "date": $date,
-                "mentionType": if ($doc = $commentHits and not($inText)) then "comment" else "text"
-            }}
-        }}
-    }}, map {{ "method": "json" }})
-    """
-    try:
-        result = await client.execute_xquery(diary_xquery.strip())
-        data = json.loads(result) if result.strip() else {}
-        total_diaries = data.get("total", 0)
-        diaries = [
-            DocumentMention(
-                id=item.get("id", ""),
-                title=item.get("title", ""),
-                date=item.get("date"),
-                doc_type="diary",
-                mention_type=item.get("mentionType", "text"),
-            )
-            for item in data.get("items", [])
-        ]
-    except Exception:
-        pass
-
-    # Query for lecture mentions
-    lecture_xquery = f"""
-    xquery version "3.1";
-    declare namespace tei="http://www.tei-c.org/ns/1.0";
-    declare namespace ft="http://exist-db.org/xquery/lucene";
-
-    let $textHits := collection('{settings.sd_data_path}/Vorlesungen')//tei:TEI[ft:query(., '{text_query}')]
-    let $commentHits := collection('{settings.sd_data_path}/Vorlesungen')//tei:TEI[ft:query(., '{comment_query}')]
-    let $allHits := ($textHits | $commentHits)
-    let $limited := subsequence($allHits, 1, {max_results})
-    return serialize(map {{
-        "total": count($allHits),
-        "items": array {{
-            for $doc in $limited
-            let $id := string($doc/@xml:id)
-            let $title := string(($doc//tei:titleStmt/tei:title)[1])
-            let $inText := $doc = $textHits
-            order by $title
-            return map {{
-                "id": $id,
-                "title": $title,
-                "date": (),
-                "mentionType": if ($doc = $commentHits and not($inText)) then "comment" else "text"
-            }}
-        }}
-    }}, map {{ "method": "json" }})
-    """
-    try:
-        result = await client.execute_xquery(lecture_xquery.strip())
-        data = json.loads(result) if result.strip() else {}
-        total_lectures = data.get("total", 0)
-        lectures = [
-            DocumentMention(
-                id=item.get("id", ""),
-                title=item.get("title", ""),
-                date=item.get("date"),
-                doc_type="lecture",
-                mention_type=item.get("mentionType", "text"),
+                letters_as_sender=senders,
+                letters_as_recipient=recipients,
+                total_letters=senders + recipients,
             )
-            for item in data.get("items", [])
-        ]
-    except Exception:
-        pass
+        letter_mentions = index_result.mentions.get(entity_type, {}).get(entry_id, [])
+        letters = letter_mentions[:max_results]
+        total_letters = len(letter_mentions)
+    if not isinstance(diary_result, BaseException):
+        diaries, total_diaries = diary_result
+    if not isinstance(lecture_result, BaseException):
+        lectures, total_lectures = lecture_result
 
     return MentionsSummary(
         correspondence=correspondence,
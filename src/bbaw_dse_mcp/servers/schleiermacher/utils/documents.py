@@ -15,7 +15,7 @@ from bbaw_dse_mcp.servers.schleiermacher.utils.citations import (
 from bbaw_dse_mcp.utils.tei import (
     clean_text,
     extract_text,
-    strip_processing_instructions,
+    parse_tei,
 )
 
 
@@ -44,13 +44,7 @@ def parse_generic_document(xml_str: str, document_id: str) -> GenericDocument:
     Returns:
         GenericDocument with extracted content
     """
-    # Clean XML
-    try:
-        xml_str = strip_processing_instructions(xml_str)
-    except etree.XMLSyntaxError:
-        pass  # Try to parse anyway
-
-    root = etree.fromstring(xml_str.encode("utf-8"))
+    root = parse_tei(xml_str)
 
     # Extract basic metadata
     doctype = root.get("{http://www.telota.de}doctype")
@@ -5,6 +5,10 @@ import logging
 
 from bbaw_dse_mcp.config.base import settings
 from bbaw_dse_mcp.config.existdb import ExistDBConfig
+from bbaw_dse_mcp.servers.schleiermacher.utils.letters import (
+    LetterRegisterIndex,
+    build_letter_register_index,
+)
 from bbaw_dse_mcp.utils.existdb import (
     ExistDBClient,
     ExistDBConnectionError,
@@ -19,6 +23,7 @@ class _ServerState:
 
     client: ExistDBClient | None = None
     letter_cache: list[dict] | None = None  # Cached letter metadata
+    letter_register_index: LetterRegisterIndex | None = None
 
 
 _state = _ServerState()
@@ -69,17 +74,21 @@ async def close_client() -> None:
         await _state.client.close()
         _state.client = None
         _state.letter_cache = None  # Clear cache on close
+        _state.letter_register_index = None
 
 
-async def get_letter_cache() -> list[dict]:
-    """Get or load letter cache from eXist-db.
+async def _load_letter_cache() -> list[dict]:
+    """Get or load letter cache from eXist-db, raising on invalid cache files.
 
-    The cache is loaded once from the JSON file in eXist-db and kept in memory
-    for fast filtering. Contains all letter metadata including correspondence,
-    dates, places, and mentions.
+    Only a successfully parsed cache is kept, so a failed load is retried
+    on the next call.
 
     Returns:
         List of letter metadata dicts
+
+    Raises:
+        json.JSONDecodeError: If the cache file is not valid JSON
+        KeyError: If the cache file has an unexpected structure
     """
     if _state.letter_cache is None:
         client = await get_client()
@@ -87,25 +96,58 @@ async def get_letter_cache() -> list[dict]:
             f"{settings.sd_cache_path}/letters/register/letters-for-register.json"
         )
 
-        try:
-            # Fetch JSON from eXist-db
-            json_content = await client.get_document_raw(cache_path)
-            cache_data = json.loads(json_content)
+        # Fetch JSON from eXist-db
+        json_content = await client.get_document_raw(cache_path)
+        cache_data = json.loads(json_content)
 
-            # Extract letter array from wrapper
-            if isinstance(cache_data, dict) and "letter" in cache_data:
-                letters = cache_data["letter"]
-            else:
-                letters = []
+        # Extract letter array from wrapper
+        if isinstance(cache_data, dict) and "letter" in cache_data:
+            letters = cache_data["letter"]
+        else:
+            letters = []
 
-            # Extract data from each letter entry
-            _state.letter_cache = [
-                entry["data"] for entry in letters if "data" in entry
-            ]
+        # Extract data from each letter entry
+        _state.letter_cache = [entry["data"] for entry in letters if "data" in entry]
 
-            logger.info(f"Loaded {len(_state.letter_cache)} letters into cache")
-        except (json.JSONDecodeError, KeyError) as e:
-            logger.warning(f"Failed to load letter cache: {e}. Using empty cache.")
-            _state.letter_cache = []
+        logger.info(f"Loaded {len(_state.letter_cache)} letters into cache")
 
     return _state.letter_cache
+
+
+async def get_letter_cache() -> list[dict]:
+    """Get or load letter cache from eXist-db.
+
+    The cache is loaded once from the JSON file in eXist-db and kept in memory
+    for fast filtering. Contains all letter metadata including correspondence,
+    dates, places, and mentions.
+
+    Returns:
+        List of letter metadata dicts, empty if the cache file is invalid
+    """
+    try:
+        return await _load_letter_cache()
+    except (json.JSONDecodeError, KeyError) as e:
+        logger.warning(f"Failed to load letter cache: {e}. Using empty cache.")
+        return []
+
+
+async def get_letter_register_index() -> LetterRegisterIndex:
+    """Get or build the register index of the letter cache.
+
+    The index is built once from the letter cache, so looking up the
+    correspondence and letter mentions of a register entry does not scan
+    all letters. Unlike get_letter_cache(), a failed load raises instead of
+    indexing an empty cache, so callers can tell "no letters" from "unknown".
+
+    Returns:
+        LetterRegisterIndex of the cached letters
+
+    Raises:
+        json.JSONDecodeError: If the letter cache file is not valid JSON
+        KeyError: If the letter cache file has an unexpected structure
+    """
+    if _state.letter_register_index is None:
+        letters = await _load_letter_cache()
+        _state.letter_register_index = build_letter_register_index(letters)
+        logger.info(f"Indexed {len(letters)} letters by register entry")
+    return _state.letter_register_index
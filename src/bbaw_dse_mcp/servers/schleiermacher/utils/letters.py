@@ -1,9 +1,13 @@
 """Letter-specific parsing and formatting for Schleiermacher Digital."""
 
+from collections import Counter
+from dataclasses import dataclass, field
+
 from lxml import etree
 
 from bbaw_dse_mcp.config.base import TEI_NS as NS
 from bbaw_dse_mcp.schemas.schleiermacher.documents import Letter
+from bbaw_dse_mcp.schemas.schleiermacher.register import DocumentMention
 from bbaw_dse_mcp.servers.schleiermacher.utils.citations import (
     get_schleiermacher_citation_url,
 )
@@ -13,7 +17,7 @@ from bbaw_dse_mcp.utils.tei import (
     parse_corresp_action,
     parse_editor,
     parse_source,
-    strip_processing_instructions,
+    parse_tei,
 )
 
 
@@ -156,10 +160,7 @@ def parse_letter(xml_str: str, doc_id: str) -> Letter:
         >>> print(letter.title)
         >>> print(letter.sender.person_name)
     """
-    # Strip processing instructions first
-    xml_str = strip_processing_instructions(xml_str)
-
-    root = etree.fromstring(xml_str.encode("utf-8"))
+    root = parse_tei(xml_str)
     header = root.find(".//tei:teiHeader", NS)
 
     if header is None:
@@ -374,3 +375,98 @@ def format_letter_as_markdown(
         parts.append(f"\n## Letter Closing\n\n{letter.closer}")
 
     return "\n".join(parts)
+
+
+# ==================== REGISTER INDEX ====================
+
+# Keys of the mention lists per register entity type in the letter cache
+MENTION_KEYS = {"person": ("persons", "person"), "place": ("places", "place")}
+
+
+@dataclass
+class LetterRegisterIndex:
+    """Letters of the register cache, indexed by register entry ID.
+
+    Attributes:
+        senders: Number of letters sent, per person ID
+        recipients: Number of letters received, per person ID
+        mentions: Letters mentioning an entry per entity type and entry ID,
+            ordered by date
+    """
+
+    senders: Counter[str] = field(default_factory=Counter)
+    recipients: Counter[str] = field(default_factory=Counter)
+    mentions: dict[str, dict[str, list[DocumentMention]]] = field(
+        default_factory=lambda: {entity_type: {} for entity_type in MENTION_KEYS}
+    )
+
+
+def _flatten(value: object) -> list:
+    """Flatten a letter cache value that is either one object or an array."""
+    if isinstance(value, list):
+        return [item for element in value for item in _flatten(element)]
+    return [value]
+
+
+def _refs(value: object, key: str) -> set[str]:
+    """Collect the IDs a sender or receiver value of the letter cache refers to."""
+    return {
+        item[key] for item in _flatten(value) if isinstance(item, dict) and key in item
+    }
+
+
+def build_letter_register_index(letters: list[dict]) -> LetterRegisterIndex:
+    """Index the letter cache by the register entries the letters refer to.
+
+    Sender and receiver can be either a single object or an array. A letter
+    counts as a text mention if any of its mentions of an entry is regular,
+    otherwise as a comment mention.
+
+    Args:
+        letters: Letter metadata dicts, as returned by get_letter_cache()
+
+    Returns:
+        LetterRegisterIndex of correspondence counts and mentions
+    """
+    index = LetterRegisterIndex()
+
+    for data in letters:
+        index.senders.update(_refs(data.get("sender"), "senderRef"))
+        index.recipients.update(_refs(data.get("receiver"), "receiverRef"))
+
+        mentions = data.get("mentions")
+        if not isinstance(mentions, dict):
+            continue
+
+        for entity_type, (group_key, item_key) in MENTION_KEYS.items():
+            group = mentions.get(group_key)
+            if not isinstance(group, dict) or not isinstance(group.get(item_key), list):
+                continue
+
+            # Entry ID -> whether any mention of it is regular
+            regular: dict[str, bool] = {}
+            for mention in _flatten(group[item_key]):
+                if isinstance(mention, dict) and "id" in mention:
+                    entry_id = mention["id"]
+                    is_regular = mention.get("type") == "regular"
+                    regular[entry_id] = regular.get(entry_id, False) or is_regular
+
+            for entry_id, is_regular in regular.items():
+                index.mentions[entity_type].setdefault(entry_id, []).append(
+                    DocumentMention(
+                        id=data.get("id", ""),
+                        title=f"Brief {data.get('idno', '')}: {data.get('dateDisplay', '')}",
+                        date=data.get("date_iso"),
+                        doc_type="letter",
+                        mention_type="text" if is_regular else "comment",
+                    )
+                )
+
+    # Order mentions by date, undated letters first
+    for by_entry in index.mentions.values():
+        for entry_mentions in by_entry.values():
+            entry_mentions.sort(
+                key=lambda mention: (mention.date is not None, mention.date or "")
+            )
+
+    return index
@@ -0,0 +1,82 @@
+"""Size-bounded in-memory cache with optional expiry.
+
+Used by the tools and resources to keep fetched or rendered data (documents,
+register entries, search results) across requests without unbounded growth.
+"""
+
+from collections import OrderedDict
+import time
+from typing import Generic, TypeVar
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """Least recently used cache whose entries optionally expire.
+
+    Once more than ``maxsize`` entries are stored, the least recently used
+    one is evicted. With a ``ttl``, entries older than that many seconds are
+    dropped when accessed; without one, they live until evicted.
+
+    Example:
+        >>> cache: TTLCache[str, str] = TTLCache(maxsize=2, ttl=60.0)
+        >>> cache.set("S0007791", "letter")
+        >>> cache.get("S0007791")
+        'letter'
+    """
+
+    def __init__(self, maxsize: int, ttl: float | None = None) -> None:
+        """Create an empty cache.
+
+        Args:
+            maxsize: Maximum number of entries
+            ttl: Seconds an entry stays valid, or None for no expiry
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[K, tuple[V, float]] = OrderedDict()
+
+    def _lookup(self, key: K) -> tuple[V, float] | None:
+        """Return the stored entry of a key, dropping it if expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if self.ttl is not None and time.monotonic() - entry[1] > self.ttl:
+            del self._entries[key]
+            return None
+        return entry
+
+    def get(self, key: K) -> V | None:
+        """Return the cached value of a key, or None if missing or expired.
+
+        A hit marks the entry as most recently used.
+        """
+        entry = self._lookup(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def set(self, key: K, value: V) -> None:
+        """Store a value, evicting the least recently used entry if full."""
+        self._entries[key] = (value, time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def __contains__(self, key: K) -> bool:
+        """Return whether a key has a value that has not expired.
+
+        Needed for caches that store None as a value, where get() cannot
+        tell a cached None from a miss.
+        """
+        return self._lookup(key) is not None
+
+    def __len__(self) -> int:
+        """Return the number of stored entries, including expired ones."""
+        return len(self._entries)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._entries.clear()
@@ -33,19 +33,34 @@ Example:
 from __future__ import annotations
 
 from http import HTTPStatus
+import importlib.util
 import logging
-from typing import TYPE_CHECKING, NoReturn, cast
+from typing import TYPE_CHECKING, Any, NoReturn, cast
 
 import httpx
 from lxml import etree
 
+from bbaw_dse_mcp.utils import jsonlib
+
 if TYPE_CHECKING:
+    from collections.abc import Mapping
     from types import TracebackType
 
     from bbaw_dse_mcp.config.existdb import ExistDBConfig
 
 logger = logging.getLogger(__name__)
 
+# Namespaces of the eXist-db REST query request format
+EXIST_NS = "http://exist.sourceforge.net/NS/exist"
+SERIALIZED_NS = "http://exist-db.org/xquery/types/serialized"
+
+# HTTP/2 needs the optional h2 package (httpx[http2])
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Scalar types that can be bound as external XQuery variables, typed as
+# xs:string, xs:boolean, xs:integer and xs:double respectively
+XQueryValue = str | bool | int | float
+
 
 class ExistDBError(Exception):
     """Base exception for eXist-db errors."""
@@ -71,6 +86,61 @@ class DocumentNotFoundError(ExistDBError):
     pass
 
 
+def _build_query_request(
+    query: str,
+    how_many: int,
+    variables: Mapping[str, XQueryValue],
+    *,
+    wrap: bool,
+) -> bytes:
+    """Build an eXist-db REST query request with bound external variables.
+
+    Args:
+        query: XQuery source declaring each variable as ``external``
+        how_many: Maximum number of results
+        variables: Variable names (without ``$``) mapped to their values
+        wrap: Whether results should be wrapped in XML
+
+    Returns:
+        Serialized <exist:query> request body
+    """
+    request = etree.Element(
+        f"{{{EXIST_NS}}}query",
+        nsmap={"exist": EXIST_NS, "sx": SERIALIZED_NS},
+        start="1",
+        max=str(how_many),
+        wrap="yes" if wrap else "no",
+    )
+    etree.SubElement(request, f"{{{EXIST_NS}}}text").text = query
+
+    variables_elem = etree.SubElement(request, f"{{{EXIST_NS}}}variables")
+    for name, value in variables.items():
+        variable = etree.SubElement(variables_elem, f"{{{EXIST_NS}}}variable")
+        qname = etree.SubElement(variable, f"{{{EXIST_NS}}}qname")
+        etree.SubElement(qname, f"{{{EXIST_NS}}}localname").text = name
+
+        # bool is a subclass of int, so it has to be tested first
+        if isinstance(value, bool):
+            value_type = "xs:boolean"
+            text = "true" if value else "false"
+        elif isinstance(value, int):
+            value_type = "xs:integer"
+            text = str(value)
+        elif isinstance(value, float):
+            value_type = "xs:double"
+            text = str(value)
+        else:
+            value_type = "xs:string"
+            text = value
+
+        sequence = etree.SubElement(variable, f"{{{SERIALIZED_NS}}}sequence")
+        etree.SubElement(
+            sequence, f"{{{SERIALIZED_NS}}}value", type=value_type
+        ).text = text
+
+    return cast("bytes", etree.tostring(request, xml_declaration=True, encoding="UTF-8"))
+
+
 class ExistDBClient:
     """Async HTTP Client for eXist-db REST API.
 
@@ -109,14 +179,25 @@ class ExistDBClient:
         self._client: httpx.AsyncClient | None = None
         self._auth = auth
         self._timeout = config.timeout
+        self._limits = httpx.Limits(
+            max_connections=config.max_connections,
+            max_keepalive_connections=config.max_keepalive_connections,
+        )
 
     @property
     def client(self) -> httpx.AsyncClient:
-        """Lazy-initialized HTTP client."""
+        """Lazy-initialized HTTP client.
+
+        The client keeps a pool of keep-alive connections that is shared by
+        all tools using this ExistDBClient, and multiplexes requests over
+        HTTP/2 when h2 is installed.
+        """
         if self._client is None:
             self._client = httpx.AsyncClient(
                 auth=self._auth,
                 timeout=self._timeout,
+                limits=self._limits,
+                http2=HTTP2_AVAILABLE,
                 follow_redirects=True,
             )
         return self._client
@@ -180,13 +261,21 @@ class ExistDBClient:
         how_many: int = 1000,
         *,
         wrap: bool = False,
+        variables: Mapping[str, XQueryValue] | None = None,
     ) -> str:
         """Execute XQuery against eXist-db REST API.
 
+        Without variables the query is sent as ``_query`` GET parameter. With
+        variables it is POSTed as an <exist:query> request, binding each value
+        to an ``external`` variable declared in the query. Since the query text
+        then stays constant across calls, eXist can reuse the compiled query
+        from its query pool, and user input never ends up in the source.
+
         Args:
             query: XQuery as string
             how_many: Maximum number of results (_howmany parameter)
             wrap: Whether results should be wrapped in XML (keyword-only)
+            variables: External variables to bind, name without ``$`` (keyword-only)
 
         Returns:
             Response text (XML or plain text, depending on query)
@@ -195,18 +284,72 @@ class ExistDBClient:
             QueryError: On XQuery errors
             ExistDBConnectionError: When server is not reachable
         """
+        response = await self._run_xquery(
+            query, how_many, wrap=wrap, variables=variables
+        )
+        return response.text
+
+    async def execute_xquery_bytes(
+        self,
+        query: str,
+        how_many: int = 1000,
+        *,
+        wrap: bool = False,
+        variables: Mapping[str, XQueryValue] | None = None,
+    ) -> bytes:
+        """Execute XQuery and return the undecoded response body.
+
+        Same as execute_xquery, but skips decoding the response so XML and
+        JSON results can be handed to lxml or jsonlib.loads as received.
+
+        Args:
+            query: XQuery as string
+            how_many: Maximum number of results (_howmany parameter)
+            wrap: Whether results should be wrapped in XML (keyword-only)
+            variables: External variables to bind, name without ``$`` (keyword-only)
+
+        Returns:
+            Raw response body
+
+        Raises:
+            QueryError: On XQuery errors
+            ExistDBConnectionError: When server is not reachable
+        """
+        response = await self._run_xquery(
+            query, how_many, wrap=wrap, variables=variables
+        )
+        return response.content
+
+    async def _run_xquery(
+        self,
+        query: str,
+        how_many: int,
+        *,
+        wrap: bool,
+        variables: Mapping[str, XQueryValue] | None,
+    ) -> httpx.Response:
+        """Send an XQuery to the REST API and return the successful response."""
         try:
-            # eXist-db REST API: Use _query parameter for XQuery
-            response = await self.client.get(
-                f"{self.base_url}/exist/rest/db",
-                params={
-                    "_query": query,
-                    "_howmany": str(how_many),
-                    "_wrap": "yes" if wrap else "no",
-                },
-            )
+            if variables:
+                response = await self.client.post(
+                    f"{self.base_url}/exist/rest/db",
+                    content=_build_query_request(
+                        query, how_many, variables, wrap=wrap
+                    ),
+                    headers={"Content-Type": "application/xml"},
+                )
+            else:
+                # eXist-db REST API: Use _query parameter for XQuery
+                response = await self.client.get(
+                    f"{self.base_url}/exist/rest/db",
+                    params={
+                        "_query": query,
+                        "_howmany": str(how_many),
+                        "_wrap": "yes" if wrap else "no",
+                    },
+                )
             response.raise_for_status()
-            return response.text
+            return response
 
         except httpx.ConnectError as e:
             raise ExistDBConnectionError(
@@ -326,7 +469,9 @@ class ExistDBClient:
 
         result = await self.execute_xquery(query.strip(), how_many=1)
 
-        if not result.strip():
+        # isspace() stops at the first character of a document, while
+        # strip() would copy all of it
+        if not result or result.isspace():
             raise DocumentNotFoundError(
                 f"Document with ID '{doc_id}' not found in {collection_path}"
             )
@@ -388,47 +533,63 @@ class ExistDBClient:
         search_term: str,
         collection: str = "",
         max_results: int = 100,
-    ) -> list[dict[str, str]]:
+    ) -> list[dict[str, Any]]:
         """Full-text search via Lucene (ft:query).
 
+        KWIC snippets are built by kwic:summarize inside the same query and
+        all hits are returned as a single JSON document, so no per-hit
+        follow-up requests are needed.
+
         Args:
             search_term: Search term (Lucene syntax)
             collection: Path relative to data_path
             max_results: Maximum results
 
         Returns:
-            List of dicts with 'id', 'title', 'snippet'
+            List of dicts with 'id', 'title', 'snippet' and 'kwic_snippets'
+            (matches marked as **term**)
         """
         collection_path = (
             f"{self.data_path}/{collection}" if collection else self.data_path
         )
 
-        # Escape single quotes in search term
-        safe_term = search_term.replace("'", "''")
-
         query = f"""
         xquery version "3.1";
         declare namespace tei="http://www.tei-c.org/ns/1.0";
         declare namespace ft="http://exist-db.org/xquery/lucene";
-
-        for $doc in collection('{collection_path}')//tei:TEI[ft:query(., '{safe_term}')]
-        let $id := $doc/@xml:id/string()
-        let $title := $doc//tei:titleStmt/tei:title[1]/text()
-        return concat($id, '|||', $title)
+        import module namespace kwic="http://exist-db.org/xquery/kwic";
+        declare variable $term external;
+        declare variable $max-results external;
+
+        let $hits := collection('{collection_path}')//tei:TEI[ft:query(., $term)]
+        return serialize(array {{
+            for $doc in subsequence($hits, 1, $max-results)
+            let $snippets :=
+                for $p in kwic:summarize($doc, <config width="40"/>)
+                return normalize-space(string-join(
+                    for $span in $p/*
+                    return if ($span/@class = 'hi') then concat('**', $span, '**')
+                    else string($span)
+                ))
+            return map {{
+                "id": $doc/@xml:id/string(),
+                "title": string(($doc//tei:titleStmt/tei:title)[1]),
+                "snippet": ($snippets[1], "")[1],
+                "kwic_snippets": array {{ $snippets }}
+            }}
+        }}, map {{ "method": "json" }})
         """
 
-        result = await self.execute_xquery(query.strip(), how_many=max_results)
-
-        # Parse "id|||title" format
-        results = []
-        for line in result.strip().split("\n"):
-            if not line.strip():
-                continue
-            parts = line.split("|||")
-            if len(parts) >= 2:  # noqa: PLR2004
-                results.append({"id": parts[0], "title": parts[1], "snippet": ""})
+        result = await self.execute_xquery_bytes(
+            query.strip(),
+            how_many=1,
+            variables={"term": search_term, "max-results": max_results},
+        )
+        if not result.strip():
+            return []
 
-        return results
+        hits: list[dict[str, Any]] = jsonlib.loads(result)
+        return hits
 
     async def count_documents(self, collection: str = "") -> int:
         """Count documents in a collection.
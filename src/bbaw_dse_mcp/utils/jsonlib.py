@@ -0,0 +1,22 @@
+"""JSON decoding with optional orjson acceleration.
+
+eXist-db returns search results as serialized JSON. When the optional
+``orjson`` package is installed (extra ``fast``) it is used to decode them,
+otherwise the standard library ``json`` module is used. Both raise a subclass
+of ``json.JSONDecodeError`` on invalid input.
+"""
+
+from collections.abc import Callable
+import json
+from typing import Any
+
+# Decode a JSON document given as text or UTF-8 encoded bytes, with the
+# fastest available parser. Chosen once at import time.
+loads: Callable[[str | bytes], Any]
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    loads = json.loads
+else:
+    loads = orjson.loads
@@ -4,6 +4,8 @@ This module provides reusable functions for parsing TEI-encoded documents
 that can be used across different digital scholarly editions.
 """
 
+from collections.abc import Iterator
+from io import BytesIO
 import re
 
 from lxml import etree
@@ -14,12 +16,22 @@ from bbaw_dse_mcp.schemas.base.tei import (
     Editor,
     SourceDescription,
 )
+from bbaw_dse_mcp.utils.cache import TTLCache
+
+# Clark notation of the telota:doctype attribute on the TEI root element
+TELOTA_DOCTYPE = "{http://www.telota.de}doctype"
+
+# LRU cache of document types, keyed by document ID. The type of a document
+# does not change, so entries never expire.
+DOCTYPE_CACHE_SIZE = 1024
+_doctype_cache: TTLCache[str, str | None] = TTLCache(DOCTYPE_CACHE_SIZE)
 
 
 def determine_doctype(xml_str: str) -> str | None:
     """Determine the document type from TEI XML string.
 
-    Extracts the telota:doctype attribute from the root TEI element.
+    Extracts the telota:doctype attribute from the root TEI element. Only
+    the start tag of the root element is parsed, not the whole document.
 
     Args:
         xml_str: TEI XML string
@@ -33,12 +45,90 @@ def determine_doctype(xml_str: str) -> str | None:
         'letter fs'
     """
     try:
-        root = etree.fromstring(xml_str.encode("utf-8"))
-        # Extract telota:doctype attribute
-        return root.get("{http://www.telota.de}doctype")
-
+        for _event, root in etree.iterparse(
+            BytesIO(xml_str.encode("utf-8")), events=("start",)
+        ):
+            # Extract telota:doctype attribute
+            return root.get(TELOTA_DOCTYPE)
     except (etree.XMLSyntaxError, AttributeError):
         return None
+    return None
+
+
+def determine_doctype_cached(doc_id: str, xml_str: str) -> str | None:
+    """Determine the document type, remembering it per document ID.
+
+    Args:
+        doc_id: Document ID (xml:id attribute)
+        xml_str: TEI XML string of the document
+
+    Returns:
+        Document type as string or None if not found
+    """
+    # None is a valid cached type, so test membership instead of the value
+    if doc_id in _doctype_cache:
+        return _doctype_cache.get(doc_id)
+    doctype = determine_doctype(xml_str)
+    _doctype_cache.set(doc_id, doctype)
+    return doctype
+
+
+def iter_elements(
+    data: bytes,
+    *tags: str,
+    remove_blank_text: bool = False,
+) -> Iterator[etree._Element]:
+    """Stream complete elements with the given tags from an XML document.
+
+    Each matching element is yielded once its end tag has been parsed.
+    Afterwards, elements not nested in another matching element are cleared
+    and removed together with their preceding siblings, so memory stays
+    flat however many elements the document contains.
+
+    Args:
+        data: Serialized XML document
+        *tags: Tags to yield, in Clark notation for namespaced elements
+        remove_blank_text: Drop whitespace-only text nodes while parsing. Only
+            safe for documents without mixed content, such as query result
+            wrappers holding plain values.
+
+    Yields:
+        Matching elements in order of their end tags
+
+    Raises:
+        etree.XMLSyntaxError: If the document is not well-formed
+    """
+    for _event, elem in etree.iterparse(
+        BytesIO(data), events=("end",), tag=tags, remove_blank_text=remove_blank_text
+    ):
+        yield elem
+        if next(elem.iterancestors(*tags), None) is None:
+            elem.clear(keep_tail=True)
+            parent = elem.getparent()
+            while parent is not None and elem.getprevious() is not None:
+                del parent[0]
+
+
+def parse_tei(xml_str: str) -> etree._Element:
+    """Parse a TEI XML string without its processing instructions.
+
+    Processing instructions are dropped by libxml2 while parsing, so the
+    document does not have to be parsed and serialized once more to strip
+    them beforehand.
+
+    Args:
+        xml_str: Raw TEI XML string
+
+    Returns:
+        Root element of the parsed document
+
+    Raises:
+        etree.XMLSyntaxError: If the document is not well-formed
+    """
+    # lxml parsers must not be shared between threads, and documents are
+    # parsed in worker threads, so each call gets its own parser
+    parser = etree.XMLParser(remove_pis=True, collect_ids=False)
+    return etree.fromstring(xml_str.encode("utf-8"), parser)
 
 
 def strip_processing_instructions(xml_str: str) -> str:
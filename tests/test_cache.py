@@ -0,0 +1,65 @@
+"""Tests for the shared TTL cache."""
+
+import pytest
+
+from bbaw_dse_mcp.utils import cache as cache_module
+from bbaw_dse_mcp.utils.cache import TTLCache
+
+
+class _Clock:
+    """Replacement for time.monotonic that only advances when told to."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> _Clock:
+    fake = _Clock()
+    monkeypatch.setattr(cache_module.time, "monotonic", fake)
+    return fake
+
+
+def test_evicts_least_recently_used() -> None:
+    cache: TTLCache[str, int] = TTLCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+
+def test_entries_expire_after_ttl(clock: _Clock) -> None:
+    cache: TTLCache[str, int] = TTLCache(maxsize=2, ttl=10.0)
+    cache.set("a", 1)
+
+    clock.now = 10.0
+    assert cache.get("a") == 1
+    clock.now = 10.5
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_entries_without_ttl_do_not_expire(clock: _Clock) -> None:
+    cache: TTLCache[str, int] = TTLCache(maxsize=2)
+    cache.set("a", 1)
+
+    clock.now = 1e9
+    assert cache.get("a") == 1
+
+
+def test_contains_tells_cached_none_from_miss(clock: _Clock) -> None:
+    cache: TTLCache[str, str | None] = TTLCache(maxsize=2, ttl=10.0)
+    cache.set("a", None)
+
+    assert "a" in cache
+    assert "b" not in cache
+    clock.now = 11.0
+    assert "a" not in cache
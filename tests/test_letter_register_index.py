@@ -0,0 +1,103 @@
+"""Tests for the register index of the Schleiermacher letter cache."""
+
+import json
+
+import pytest
+
+from bbaw_dse_mcp.servers.schleiermacher.utils import existdb
+from bbaw_dse_mcp.servers.schleiermacher.utils.letters import build_letter_register_index
+
+
+def _letter(letter_id: str, date: str | None = None, **fields: object) -> dict:
+    """Build a letter cache entry."""
+    return {"id": letter_id, "idno": letter_id, "dateDisplay": "", "date_iso": date, **fields}
+
+
+def _persons(*mentions: tuple[str, str]) -> dict:
+    """Build the mentions of a letter cache entry from (ID, type) pairs."""
+    return {"persons": {"person": [{"id": entry_id, "type": kind} for entry_id, kind in mentions]}}
+
+
+def test_sender_and_receiver_as_object_or_array() -> None:
+    letters = [
+        _letter("L1", sender={"senderRef": "P1"}, receiver={"receiverRef": "P2"}),
+        _letter(
+            "L2",
+            sender=[{"senderRef": "P1"}, {"senderRef": "P3"}],
+            receiver=[{"receiverRef": "P2"}, [{"receiverRef": "P4"}]],
+        ),
+    ]
+
+    index = build_letter_register_index(letters)
+
+    assert index.senders == {"P1": 2, "P3": 1}
+    assert index.recipients == {"P2": 2, "P4": 1}
+
+
+def test_duplicate_reference_counts_letter_once() -> None:
+    letters = [
+        _letter("L1", sender=[{"senderRef": "P1"}, {"senderRef": "P1"}]),
+    ]
+
+    index = build_letter_register_index(letters)
+
+    assert index.senders == {"P1": 1}
+
+
+def test_regular_mention_wins_over_comment() -> None:
+    letters = [
+        _letter("L1", mentions=_persons(("P1", "comment"), ("P1", "regular"))),
+        _letter("L2", mentions=_persons(("P1", "comment"), ("P2", "comment"))),
+    ]
+
+    index = build_letter_register_index(letters)
+
+    assert [(m.id, m.mention_type) for m in index.mentions["person"]["P1"]] == [
+        ("L1", "text"),
+        ("L2", "comment"),
+    ]
+    assert [m.mention_type for m in index.mentions["person"]["P2"]] == ["comment"]
+
+
+def test_mentions_ordered_by_date_undated_first() -> None:
+    letters = [
+        _letter("L1", "1810-05-01", mentions=_persons(("P1", "regular"))),
+        _letter("L2", None, mentions=_persons(("P1", "regular"))),
+        _letter("L3", "1799-01-01", mentions=_persons(("P1", "regular"))),
+    ]
+
+    index = build_letter_register_index(letters)
+
+    assert [m.id for m in index.mentions["person"]["P1"]] == ["L2", "L3", "L1"]
+
+
+def test_malformed_mentions_are_skipped() -> None:
+    letters = [
+        _letter("L1", mentions="none"),
+        _letter("L2", mentions={"persons": {"person": {"id": "P1"}}}),
+        _letter("L3", mentions={"places": {"place": [{"type": "regular"}]}}),
+    ]
+
+    index = build_letter_register_index(letters)
+
+    assert index.mentions == {"person": {}, "place": {}}
+
+
+class _InvalidCacheClient:
+    """eXist-db client whose letter cache file is not valid JSON."""
+
+    async def get_document_raw(self, _path: str) -> str:
+        return "{not json"
+
+
+async def test_failed_load_is_not_indexed(monkeypatch: pytest.MonkeyPatch) -> None:
+    state = existdb._ServerState()
+    state.client = _InvalidCacheClient()  # type: ignore[assignment]
+    monkeypatch.setattr(existdb, "_state", state)
+
+    with pytest.raises(json.JSONDecodeError):
+        await existdb.get_letter_register_index()
+    assert state.letter_register_index is None
+
+    assert await existdb.get_letter_cache() == []
+    assert state.letter_cache is None
@@ -0,0 +1,165 @@
+"""Tests for the pruned substring search of the Wohntopographie."""
+
+import pytest
+
+from bbaw_dse_mcp.schemas.mop.mop import ResidentialTopography
+from bbaw_dse_mcp.servers.mop.tools import wohntopo
+
+YEAR = 1800
+
+# (Name, Vorname, Kategorie1, Kategorie2, Straße) per entry
+ROWS = [
+    ("von Humboldt", "Alexander", "Wissenschaft", None, "Oranienburger Straße"),
+    ("Humboldt", "Wilhelm", "Diplomatie", "Wissenschaft", "Unter den Linden"),
+    ("Voß", "Julie", "Königliche Familie", None, "Wilhelmstraße"),
+    ("Voss", "Sophie", "Hofstaat", "Königliche Familie", "Wilhelmstrasse"),
+    ("Ancillon", None, "Diplomatie", None, "Große Friedrichstraße"),
+    ("", "Anna", None, None, None),
+    (None, None, None, None, ""),
+    ("de la Motte Fouqué", "Friedrich", "Militär", None, "Am  Lustgarten"),
+]
+
+PATTERNS = [
+    # Short single-word patterns, answered from the token index
+    "a",
+    "vo",
+    "oß",
+    "voß",
+    "ss",
+    "str",
+    "zz",
+    # Short patterns with whitespace, which disable pruning
+    "n h",
+    "la ",
+    " de",
+    "m  l",
+    # Trigram-sized patterns, with and without whitespace
+    "humboldt",
+    "von humboldt",
+    "straße",
+    "strasse",
+    "wilhelmstr",
+    "königliche familie",
+    "am  lustgarten",
+    "xyzxyz",
+]
+
+
+def _topography() -> ResidentialTopography:
+    """Build and index a small dataset from ROWS."""
+    features = [
+        {
+            "type": "Feature",
+            "geometry": None,
+            "properties": {
+                "Tabellen-ID": i,
+                "Name": name,
+                "Vorname": vorname,
+                "Kategorie1": kategorie1,
+                "Kategorie2": kategorie2,
+                "Straße": strasse,
+            },
+        }
+        for i, (name, vorname, kategorie1, kategorie2, strasse) in enumerate(ROWS)
+    ]
+    topo = ResidentialTopography.model_validate({"features": features})
+    topo.build_search_index()
+    return topo
+
+
+def _scan(topo: ResidentialTopography, field: str, pattern: str) -> set[int]:
+    """Find the matching positions by checking every feature."""
+    return {
+        i
+        for i, feature in enumerate(topo.features)
+        if pattern in (getattr(feature.properties, field) or "").casefold()
+    }
+
+
+@pytest.mark.parametrize("field", ResidentialTopography.SEARCH_FIELDS)
+@pytest.mark.parametrize("pattern", PATTERNS)
+def test_candidates_include_all_matches(field: str, pattern: str) -> None:
+    topo = _topography()
+    pattern = pattern.casefold()
+
+    candidates = topo.substring_candidates(field, pattern)
+
+    if candidates is not None:
+        assert _scan(topo, field, pattern) <= candidates
+
+
+def test_sharp_s_matches_ss() -> None:
+    topo = _topography()
+
+    # "ß" and "ss" case-fold alike, in the index as well as in the pattern
+    assert _scan(topo, "strasse", "straße".casefold()) == {0, 2, 3, 4}
+    assert topo.substring_candidates("strasse", "straße".casefold()) >= {0, 2, 3, 4}
+    assert _scan(topo, "name", "voß".casefold()) == {2, 3}
+    assert topo.substring_candidates("name", "voß".casefold()) >= {2, 3}
+
+
+def test_empty_and_missing_fields_never_match() -> None:
+    topo = _topography()
+
+    assert 5 not in topo.substring_candidates("name", "a")
+    assert topo.folded_values("name")[5] == ""
+    assert topo.folded_values("name")[6] == ""
+    assert topo.folded_values("strasse")[6] == ""
+
+
+@pytest.mark.parametrize(
+    ("field", "pattern"),
+    [
+        ("name", "a"),
+        ("name", "n h"),
+        ("name", "humboldt"),
+        ("name", "VOß"),
+        ("vorname", "li"),
+        ("strasse", "Straße"),
+        ("strasse", "m  l"),
+        ("taetigkeit", "x"),
+    ],
+)
+async def test_search_matches_plain_scan(
+    monkeypatch: pytest.MonkeyPatch, field: str, pattern: str
+) -> None:
+    topo = _topography()
+    monkeypatch.setitem(wohntopo._wohntopo_cache, YEAR, topo)
+    filters = dict.fromkeys(("name", "vorname", "taetigkeit", "stadt", "strasse"))
+    filters[field] = pattern
+
+    result = await wohntopo._search_topography(
+        (
+            YEAR,
+            filters["name"],
+            filters["vorname"],
+            None,
+            filters["taetigkeit"],
+            filters["stadt"],
+            filters["strasse"],
+            None,
+            False,
+            len(ROWS),
+        )
+    )
+
+    expected = _scan(topo, field, pattern.casefold())
+    assert result["total_matches"] == len(expected)
+    assert [r["tabellen_id"] for r in result["results"]] == sorted(expected)
+
+
+@pytest.mark.parametrize("kategorie", ["Familie", "wissenschaft", "dip", "e f"])
+async def test_kategorie_search_matches_plain_scan(
+    monkeypatch: pytest.MonkeyPatch, kategorie: str
+) -> None:
+    topo = _topography()
+    monkeypatch.setitem(wohntopo._wohntopo_cache, YEAR, topo)
+
+    result = await wohntopo._search_topography(
+        (YEAR, None, None, kategorie, None, None, None, None, False, len(ROWS))
+    )
+
+    pattern = kategorie.casefold()
+    expected = _scan(topo, "kategorie1", pattern) | _scan(topo, "kategorie2", pattern)
+    assert result["total_matches"] == len(expected)
+    assert [r["tabellen_id"] for r in result["results"]] == sorted(expected)